@@ -0,0 +1,56 @@
+"""KRX 파일 다운로드 파서 벤치마크
+
+같은 화면을 xls 와 csv 로 내려받은 파일을 read_excel / read_csv 로 읽는 시간을
+비교한다. 파일은 benchmarks/payloads/<bld 이름>_<일자>.<xls|csv> 에 저장한다.
+
+저장소 루트에서 모듈로 실행한다 (pip install -e . 로 설치했다면 스크립트로 실행해도 된다).
+
+    $ python -m benchmarks.file_parser_bench --record 20200831   # 파일 저장 (네트워크 필요)
+    $ python -m benchmarks.file_parser_bench                     # 저장된 파일 비교
+"""
+import io
+import os
+import sys
+import glob
+import timeit
+import pandas as pd
+from pykrx.website.krx.krxio import read_table
+from pykrx.website.krx.market.core import MKD81004, MKD30015
+
+PAYLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "payloads")
+
+
+def record(date):
+    os.makedirs(PAYLOADS, exist_ok=True)
+    for fetcher, params in ((MKD81004(), dict(market_gubun="ALL", schdate=date)),
+                            (MKD30015(), dict(market_gubun="ALL", schdate=date))):
+        name = type(fetcher).__name__
+        for filetype in ("xls", "csv"):
+            fetcher.filetype = filetype
+            content = fetcher.post(**params).getvalue()
+            path = os.path.join(PAYLOADS, "{}_{}.{}".format(name, date, filetype))
+            with open(path, "wb") as f:
+                f.write(content)
+            print("{} {:>10,} bytes".format(path, len(content)))
+
+
+def compare():
+    for xls in sorted(glob.glob(os.path.join(PAYLOADS, "*.xls"))):
+        csv = xls[:-3] + "csv"
+        if not os.path.exists(csv):
+            continue
+        print(os.path.basename(xls)[:-4])
+        for path, parse in ((xls, lambda b: pd.read_excel(io.BytesIO(b), dtype=str)),
+                            (csv, lambda b: read_table(io.BytesIO(b)))):
+            with open(path, "rb") as f:
+                content = f.read()
+            elapsed = min(timeit.repeat(lambda: parse(content), number=3, repeat=3)) / 3
+            rows = len(parse(content))
+            print("  {:<4} {:6,} rows {:8.2f} ms".format(path[-3:], rows, elapsed * 1000))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--record":
+        record(sys.argv[2])
+    else:
+        compare()
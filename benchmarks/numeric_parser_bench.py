@@ -0,0 +1,55 @@
+"""KRX 숫자 문자열 변환 벤치마크
+
+전 종목 MKD81004 결과와 같은 형태의 DataFrame 을 만들어서 기존의 정규식
+df.replace 방식과 컬럼 단위 변환(parse_frame)의 수행 시간을 비교한다.
+
+저장소 루트에서 모듈로 실행한다 (pip install -e . 로 설치했다면 스크립트로 실행해도 된다).
+
+    $ python -m benchmarks.numeric_parser_bench
+"""
+import timeit
+import numpy as np
+import pandas as pd
+from pykrx.website.comm.parse import parse_frame
+
+DTYPES = {'시가': np.int32, '고가': np.int32, '저가': np.int32, '종가': np.int32,
+          '거래량': np.int64, '거래대금': np.int64, '시가총액': np.int64,
+          '시총비중': np.float16, '상장주식수': np.int64}
+
+
+def _number(values):
+    return ["{:,}".format(x) for x in values]
+
+
+def make_frame(rows=2500, seed=0):
+    rng = np.random.RandomState(seed)
+    data = {'종목코드': ["{:06d}".format(x) for x in range(rows)],
+            '종목명': ["종목{}".format(x) for x in range(rows)]}
+    for column in DTYPES:
+        if column == '시총비중':
+            data[column] = ["{:.2f}".format(x) for x in rng.rand(rows)]
+        else:
+            data[column] = _number(rng.randint(0, 10 ** 9, rows))
+    df = pd.DataFrame(data)
+    # 거래가 없는 종목은 빈 문자열로 내려온다
+    df.loc[rng.rand(rows) < 0.05, ['시가', '고가', '저가']] = ''
+    return df
+
+
+def regex_replace(df):
+    df = df.replace(',', '', regex=True)
+    df = df.replace(r'^$', '0', regex=True)
+    df = df.replace('/', '', regex=True)
+    return df.astype(dict({'종목코드': str, '종목명': str}, **DTYPES))
+
+
+def column_parse(df):
+    return parse_frame(df, DTYPES)
+
+
+if __name__ == "__main__":
+    df = make_frame()
+    pd.testing.assert_frame_equal(regex_replace(df), column_parse(df))
+    for func in (regex_replace, column_parse):
+        elapsed = min(timeit.repeat(lambda: func(df), number=5, repeat=3)) / 5
+        print("{:<15} {:8.2f} ms".format(func.__name__, elapsed * 1000))
@@ -0,0 +1,78 @@
+"""pykrx.stock 을 asyncio 에서 호출하기 위한 스레드 풀 래퍼
+
+pykrx.stock 과 같은 이름과 파라미터를 갖는 코루틴을 제공한다. 비동기 I/O 가
+아니다 - HTTP 요청은 requests 의 블로킹 방식 그대로이고, 각 코루틴은 pykrx.stock
+함수를 ThreadedExecutor 의 스레드에서 실행해서 이벤트 루프가 멈추지 않게 할
+뿐이다. 따라서 동시에 진행되는 조회 수는 이벤트 루프가 아니라 스레드 수
+(기본값 16, set_concurrency() 로 변경)로 제한된다.
+
+    import asyncio
+    from pykrx.stock import aio
+
+    async def main(tickers):
+        jobs = [aio.get_market_ohlcv_by_date("20200101", "20200630", t) for t in tickers]
+        return await asyncio.gather(*jobs)
+"""
+import functools
+from pykrx.stock import api
+from pykrx.website.comm import ThreadedExecutor
+
+
+def set_concurrency(max_workers):
+    """동시에 진행할 수 있는 조회 수(스레드 수)를 지정"""
+    ThreadedExecutor().set_max_workers(max_workers)
+
+
+def _threaded(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await ThreadedExecutor().run(func, *args, **kwargs)
+    return wrapper
+
+
+get_nearest_business_day_in_a_week = _threaded(api.get_nearest_business_day_in_a_week)
+get_business_days = _threaded(api.get_business_days)
+
+# 주식
+get_market_ticker_list = _threaded(api.get_market_ticker_list)
+get_market_ticker_list_range = _threaded(api.get_market_ticker_list_range)
+get_market_ticker_name = _threaded(api.get_market_ticker_name)
+get_market_ohlcv_by_date = _threaded(api.get_market_ohlcv_by_date)
+get_market_ohlcv_by_ticker = _threaded(api.get_market_ohlcv_by_ticker)
+get_market_cap_by_date = _threaded(api.get_market_cap_by_date)
+get_market_cap_by_ticker = _threaded(api.get_market_cap_by_ticker)
+get_exhaustion_rates_of_foreign_investment_by_ticker = \
+    _threaded(api.get_exhaustion_rates_of_foreign_investment_by_ticker)
+get_market_price_change_by_ticker = _threaded(api.get_market_price_change_by_ticker)
+get_market_fundamental_by_date = _threaded(api.get_market_fundamental_by_date)
+get_market_fundamental_by_ticker = _threaded(api.get_market_fundamental_by_ticker)
+get_market_trading_volume_by_date = _threaded(api.get_market_trading_volume_by_date)
+get_market_trading_value_by_date = _threaded(api.get_market_trading_value_by_date)
+get_market_trading_value_and_volume_by_ticker = \
+    _threaded(api.get_market_trading_value_and_volume_by_ticker)
+
+# 지수
+get_index_ticker_list = _threaded(api.get_index_ticker_list)
+get_index_ticker_name = _threaded(api.get_index_ticker_name)
+get_index_portfolio_deposit_file = _threaded(api.get_index_portfolio_deposit_file)
+get_index_ohlcv_by_date = _threaded(api.get_index_ohlcv_by_date)
+get_index_status_by_group = _threaded(api.get_index_status_by_group)
+get_index_price_change_by_name = _threaded(api.get_index_price_change_by_name)
+
+# 공매도
+get_shorting_status_by_date = _threaded(api.get_shorting_status_by_date)
+get_shorting_volume_by_ticker = _threaded(api.get_shorting_volume_by_ticker)
+get_shorting_volume_by_date = _threaded(api.get_shorting_volume_by_date)
+get_shorting_investor_volume_by_date = _threaded(api.get_shorting_investor_volume_by_date)
+get_shorting_investor_price_by_date = _threaded(api.get_shorting_investor_price_by_date)
+get_shorting_volume_top50 = _threaded(api.get_shorting_volume_top50)
+get_shorting_balance_by_date = _threaded(api.get_shorting_balance_by_date)
+get_shorting_balance_top50 = _threaded(api.get_shorting_balance_top50)
+
+# ETF
+get_etf_ticker_list = _threaded(api.get_etf_ticker_list)
+get_etf_isin = _threaded(api.get_etf_isin)
+get_etf_ohlcv_by_date = _threaded(api.get_etf_ohlcv_by_date)
+get_etf_portfolio_deposit_file = _threaded(api.get_etf_portfolio_deposit_file)
+get_etf_price_deviation = _threaded(api.get_etf_price_deviation)
+get_etf_tracking_error = _threaded(api.get_etf_tracking_error)
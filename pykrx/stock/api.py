@@ -1,8 +1,23 @@
 from pykrx.website import krx
 from pykrx.website import naver
+from pykrx.website.comm import RequestPolicy, ResponseCache
+from pykrx.stock.store import DataStore
+from pykrx.stock.universe import UniverseHistory
+from pykrx.stock.output import PROFILES, FORMATS, apply_dtype_profile, to_format
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
 import datetime
+import numpy as np
 import pandas as pd
 
+# 여러 종목을 한 번에 조회할 때 사용하는 worker 수
+_MAX_WORKERS = 8
+# 반환 값에 적용되는 출력 옵션
+_options = {'dtype_profile': "default", 'output': "pandas"}
+# 공개 API 안에서 다른 공개 API를 호출하는 깊이
+_local = threading.local()
+
 
 def _datetime2string(dt, freq='d'):
     if freq.upper() == 'Y':
@@ -13,30 +28,238 @@ def _datetime2string(dt, freq='d'):
         return dt.strftime("%Y%m%d")
 
 
+# freq 별 pandas period
+_PERIODS = {'w': 'W', 'm': 'M', 'q': 'Q', 'y': 'Y'}
+# 데이터 종류별 집계 방법
+_OHLCV_HOW = {'시가': 'first', '고가': 'max', '저가': 'min', '종가': 'last', '거래량': 'sum'}
+_CAP_HOW = {'시가총액': 'last', '거래량': 'sum', '거래대금': 'sum', '상장주식수': 'last'}
+_FUNDAMENTAL_HOW = {'DIV': 'first', 'BPS': 'first', 'PER': 'first', 'EPS': 'first',
+                    'PBR': 'first'}
+
+
 def resample_ohlcv(df, freq, how):
+    """일자별 데이터를 주/월/분기/년 단위로 집계
+    :param df   : 날짜 index 또는 (날짜, 티커) MultiIndex의 DataFrame
+    :param freq : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
+    :param how  : {컬럼: 집계 방법} 또는 모든 컬럼에 적용할 집계 방법
+                  - first / last / max / min / sum / mean
+    :return:    : 기간의 마지막 날짜로 표시된 DataFrame - 티커별로 집계된다
+    """
+    if freq == 'd' or len(df) == 0:
+        return df
+    if freq not in _PERIODS:
+        raise ValueError("choose a freq parameter in ('d', 'w', 'm', 'q', 'y')")
+
+    # 기간의 마지막 날짜를 key로 만들어서 groupby 집계 한 번으로 처리한다
+    panel = isinstance(df.index, pd.MultiIndex)
+    dates = df.index.get_level_values(0) if panel else df.index
+    keys = dates.to_period(_PERIODS[freq]).to_timestamp(how='end').normalize()
+    if panel:
+        keys = [keys, df.index.get_level_values(1)]
+    if isinstance(how, dict):
+        how = {column: how[column] for column in df.columns if column in how}
+    else:
+        how = {column: how for column in df.columns}
+    df = df[list(how)]
+    # 합계는 int32 범위를 넘을 수 있다
+    summed = [c for c in how
+              if how[c] == 'sum' and df[c].dtype.kind == 'i' and df[c].dtype.itemsize < 8]
+    if len(summed) > 0:
+        df = df.astype({c: np.int64 for c in summed})
+    result = df.groupby(keys, sort=True).agg(how)
+    result.index.names = df.index.names
+    return result
+
+
+# 서버에서 집계된 봉을 받을 수 있는 freq 와 Naver timeframe
+_TIMEFRAMES = {'w': 'week', 'm': 'month'}
+
+
+def _has_trading_day(fromdate, todate):
+    """[fromdate, todate] 구간에 거래일이 있는지 확인 - 달력을 받지 못하면 평일로 판단"""
+    if fromdate > todate:
+        return False
+    try:
+        return len(krx.trading_days(fromdate.strftime("%Y%m%d"), todate.strftime("%Y%m%d"))) > 0
+    except krx.CalendarError:
+        return np.busday_count(fromdate.date(), (todate + pd.Timedelta(days=1)).date()) > 0
+
+
+def _is_period_aligned(fromdate, todate, freq):
+    """조회 기간이 주/월의 경계와 맞는지 확인
+    기간의 시작과 fromdate 사이, todate와 기간의 끝 사이에 거래일이 없으면 경계로 본다.
+    오늘이 포함된 기간은 일봉을 집계해도 진행 중인 봉이므로 경계로 본다.
     """
-    :param df   : KRX OLCV format의 DataFrame
-    :param freq : d - 일 / m - 월 / y - 년
-    :return:    : resampling된 DataFrame
+    period = freq.upper()
+    strt = pd.Timestamp(fromdate)
+    last = pd.Timestamp(todate)
+    head = strt.to_period(period).start_time
+    tail = last.to_period(period).end_time.normalize()
+    if _has_trading_day(head, strt - pd.Timedelta(days=1)):
+        return False
+    today = pd.Timestamp(datetime.date.today())
+    return last >= today or not _has_trading_day(last + pd.Timedelta(days=1), tail)
+
+
+def set_request_policy(target=None, **kwargs):
+    """네트워크 요청의 timeout / 재시도 / circuit breaker 정책 변경
+    :param target: 정책을 적용할 url 또는 호스트 (예: file.krx.co.kr)
+                   - 입력하지 않으면 모든 endpoint에 적용
+    :param kwargs:
+        timeout           - (연결, 읽기) timeout 초
+        retries           - 일시적인 실패를 재시도하는 최대 횟수
+        backoff           - 첫 재시도의 최대 대기 시간 (초)
+        max_backoff       - 재시도 대기 시간의 상한 (초)
+        failure_threshold - circuit breaker가 열리는 연속 실패 횟수
+        reset_timeout     - 열린 circuit breaker가 다시 요청을 시도하기까지의 시간 (초)
     """
-    if freq != 'd' and len(df) > 0:
-        if freq == 'm':
-            df = df.resample('M').apply(how)
-        elif freq == 'y':
-            df = df.resample('Y').apply(how)
-        else:
-            print("choose a freq parameter in ('m', 'y', 'd')")
-            raise RuntimeError
-    return df
+    RequestPolicy().configure(target, **kwargs)
+
+
+def set_cache(enabled=None, path=None, max_size=None, ttl=None):
+    """응답 캐시 설정
+    :param enabled : 캐시 사용 여부 (True/False)
+    :param path    : 캐시 파일 경로 - 기본값은 PYKRX_CACHE_DIR/responses.sqlite
+    :param max_size: 캐시의 최대 크기 (bytes)
+    :param ttl     : 오늘이 포함된 조회 결과의 유효 시간 (초)
+    """
+    ResponseCache().configure(enabled, path, max_size, ttl)
+
+
+def get_cache_stats():
+    """응답 캐시 통계
+    :return: hits / misses / evictions / entries / size 를 담은 dict
+    """
+    return ResponseCache().stats()
+
+
+def clear_cache():
+    ResponseCache().clear()
+
+
+def set_store(enabled=None, path=None):
+    """일자별 데이터 로컬 저장소 설정
+    :param enabled: 저장소 사용 여부 (True/False)
+    :param path   : 저장소 디렉터리 - 기본값은 PYKRX_CACHE_DIR/store
+    """
+    DataStore().configure(enabled, path)
+
+
+def set_ticker_master(path=None, ttl=None):
+    """종목 정보(티커/ISIN/종목명/시장)와 지수/ETF 정보 저장 설정
+    :param path: 저장 디렉터리 - 기본값은 PYKRX_CACHE_DIR/ticker
+    :param ttl : 저장된 종목 정보를 다시 받지 않고 사용하는 시간 (초)
+    """
+    krx.set_stock_ticker_master(path, ttl)
+    krx.EtfTicker().configure(path)
+
+
+def refresh_ticker_master(part=None):
+    """저장된 종목 정보를 KRX에서 다시 받는다 - 신규 상장/상폐를 바로 반영할 때 사용
+    :param part: listed (상장) / delisted (상폐) / index (지수) - 입력하지 않으면 모두
+    """
+    krx.refresh_stock_ticker_master(part)
+
+
+def set_dtype_profile(profile):
+    """pykrx.stock 이 반환하는 DataFrame의 dtype 설정
+    :param profile: default - 기존 dtype 유지
+                    safe    - int64 / float64로 넓혀서 overflow를 막는다
+                    compact - 종목명 등의 문자열은 category, 정수는 int32(값이 넘지 않을 때),
+                              실수는 float32 - int32 컬럼끼리의 곱셈이나 누적합은 넘칠 수 있다
+    """
+    if profile not in PROFILES:
+        raise ValueError("choose a dtype profile in {}".format(PROFILES))
+    _options['dtype_profile'] = profile
+
+
+def set_output_format(fmt):
+    """pykrx.stock 이 반환하는 결과의 형식 설정 - 함수마다 output 파라미터로도 지정할 수 있다
+    :param fmt: pandas (기본값) / arrow (pyarrow.Table) / polars (polars.DataFrame)
+    """
+    if fmt not in FORMATS:
+        raise ValueError("choose an output format in {}".format(FORMATS))
+    _options['output'] = fmt
+
+
+def _output(func):
+    """공개 API의 반환 값에 출력 옵션(dtype profile, 형식)을 적용
+
+    공개 API 안에서 호출된 다른 공개 API는 pandas DataFrame을 그대로 받도록
+    가장 바깥 호출에만 적용한다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, output=None, **kwargs):
+        depth = getattr(_local, 'depth', 0)
+        _local.depth = depth + 1
+        try:
+            df = func(*args, **kwargs)
+        finally:
+            _local.depth = depth
+        if depth > 0:
+            return df
+        df = apply_dtype_profile(df, _options['dtype_profile'])
+        return to_format(df, output or _options['output'])
+    return wrapper
+
+
+def _is_multi_ticker(ticker):
+    return not isinstance(ticker, str) or ticker == "ALL"
+
+
+def _fetch_panel(func, fromdate, todate, ticker, **kwargs):
+    """여러 종목을 동시에 조회해서 하나의 DataFrame으로 반환
+    :param func  : 한 종목을 조회하는 함수 - func(fromdate, todate, ticker, **kwargs)
+    :param ticker: 티커 리스트 또는 "ALL" (todate에 상장된 전 종목)
+    :return      : (날짜, 티커) MultiIndex DataFrame
+                             시가   고가   저가   종가    거래량
+        날짜        티커
+        2020-07-01  000020  14200  14350  13950  14050    290614
+                    005930  53400  53600  52400  52600  17969695
+    """
+    if isinstance(ticker, str):
+        ticker = get_market_ticker_list(todate, market="ALL")
+    tickers = list(ticker)
+
+    # 종목별 결과가 아닌 합쳐진 결과에 출력 옵션을 적용한다
+    func = getattr(func, '__wrapped__', func)
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        futures = [executor.submit(func, fromdate, todate, t, **kwargs) for t in tickers]
+        frames = [future.result() for future in futures]
+
+    keys = [t for t, df in zip(tickers, frames) if not df.empty]
+    frames = [df for df in frames if not df.empty]
+    if len(frames) == 0:
+        return pd.DataFrame()
+    # 프레임을 한 번만 복사하도록 concat을 한 번에 수행한다
+    df = pd.concat(frames, keys=keys, names=['티커', '날짜'])
+    return df.swaplevel().sort_index()
 
 
 def get_nearest_business_day_in_a_week():
-    curr = datetime.datetime.now()
-    prev = curr - datetime.timedelta(days=7)
-    curr = _datetime2string(curr)
-    prev = _datetime2string(prev)
-    df = krx.get_index_ohlcv_by_date(prev, curr, "1001")
-    return df.index[-1].strftime("%Y%m%d")
+    return krx.nearest_business_day()
+
+
+def is_trading_day(date):
+    """거래일 여부 - 오늘 이후의 날짜는 평일이면 거래일로 추정한다
+    :param date: 조회 일자 (YYYYMMDD)
+    """
+    return krx.is_trading_day(date)
+
+
+def get_previous_business_day(date):
+    """date 이전의 가장 가까운 거래일 (YYYYMMDD)"""
+    return krx.prev_trading_day(date)
+
+
+def get_next_business_day(date):
+    """date 이후의 가장 가까운 거래일 (YYYYMMDD)"""
+    return krx.next_trading_day(date)
+
+
+def get_trading_days(fromdate, todate):
+    """[fromdate, todate] 구간의 거래일 리스트 (YYYYMMDD)"""
+    return krx.trading_days(fromdate, todate)
 
 
 # -----------------------------------------------------------------------------
@@ -50,31 +273,78 @@ def get_market_ticker_list(date=None, market="KOSPI"):
     """
     if date is None:
         date = get_nearest_business_day_in_a_week()
+    return UniverseHistory().tickers(date, market, _ticker_snapshot(market), _delist_dates,
+                                     krx.trading_days)
+
+
+@_output
+def get_market_ticker_list_range(fromdate, todate, market="KOSPI"):
+    """기간 동안의 일자별 상장 종목
+    :param fromdate: 조회 시작 일자 (YYYYMMDD)
+    :param todate  : 조회 종료 일자 (YYYYMMDD)
+    :param market  : 조회 시장 (KOSPI/KOSDAQ/KONEX/ALL)
+    :return        : 날짜 x 티커의 상장 여부(bool) DataFrame
+                    000020  000040  000050  ...
+        2019-02-25    True    True    True  ...
+        2019-02-26    True    True    True  ...
+    """
+    return UniverseHistory().membership(fromdate, todate, market, _ticker_snapshot(market),
+                                        _delist_dates, krx.trading_days)
+
+
+def _ticker_snapshot(market):
+    def fetch(date):
+        return krx.get_market_ticker_and_name(date, market).index.to_list()
+    return fetch
+
 
-    s = krx.get_market_ticker_and_name(date, market)
-    return s.index.to_list()
+def _delist_dates(tickers):
+    s = krx.resolve_delist_dates(tickers).dropna()
+    return {ticker: str(dd).replace('/', '').replace('-', '') for ticker, dd in s.items()}
+
+
+def _delist_date(ticker):
+    return lambda: _delist_dates([ticker]).get(ticker)
 
 
 def get_market_ticker_name(ticker):
     return krx.get_stock_name(ticker)
 
 
+def resolve_isins(tickers):
+    """여러 종목의 ISIN을 한 번에 조회
+    :param tickers: 티커 리스트
+    :return       : 티커를 index로 갖는 ISIN Series - 없는 종목은 None
+    """
+    return krx.resolve_isins(tickers)
+
+
+def resolve_names(tickers):
+    """여러 종목의 종목명을 한 번에 조회
+    :param tickers: 티커 리스트
+    :return       : 티커를 index로 갖는 종목명 Series - 없는 종목은 None
+    """
+    return krx.resolve_names(tickers)
+
+
 def get_business_days(year, mon):
-    strt = "{}{:02d}01".format(year, mon)
-    last = "{}{:02d}01".format(year, mon+1)
-    df = get_market_ohlcv_by_date(strt, last, "000020")
-    if df.index[-1].month != int(mon):
-        df = df.iloc[:-1]
-    return df.index.tolist()
+    period = pd.Period(year=int(year), month=int(mon), freq='M')
+    days = krx.trading_days(period.start_time.strftime("%Y%m%d"),
+                            period.end_time.strftime("%Y%m%d"))
+    return [pd.Timestamp(day) for day in days]
 
 
+@_output
 def get_market_ohlcv_by_date(fromdate, todate, ticker, freq='d', adjusted=True,
                              name_display=False):
     """지정된 일자의 OHLCV 조회
     :param fromdate: 조회 시작 일자 (YYYYMMDD)
     :param todate  : 조회 종료 일자 (YYYYMMDD)
-    :param ticker  : 조회할 종목의 티커
-    :param freq    : d - 일 / m - 월 / y - 년
+    :param ticker  : 조회할 종목의 티커 - 티커 리스트나 "ALL"을 입력하면 (날짜, 티커)
+                     MultiIndex DataFrame을 반환
+    :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
+                     수정 종가의 주/월 단위 조회는 기간이 주/월의 경계와 맞으면
+                     Naver 의 주봉/월봉을 그대로 사용한다
     :param adjusted: 수정 종가 여부 (True/False)
     :param name_display : columns의 이름 출력 여부 (True/False)
     :return:
@@ -85,19 +355,31 @@ def get_market_ohlcv_by_date(fromdate, todate, ticker, freq='d', adjusted=True,
     if isinstance(todate, datetime.datetime):
         todate = _datetime2string(todate)
 
+    if _is_multi_ticker(ticker):
+        return _fetch_panel(get_market_ohlcv_by_date, fromdate, todate, ticker,
+                            freq=freq, adjusted=adjusted)
+
+    if adjusted and freq in _TIMEFRAMES and _is_period_aligned(fromdate, todate, freq):
+        df = naver.get_market_ohlcv_by_date(fromdate, todate, ticker, _TIMEFRAMES[freq])
+        if name_display:
+            df.columns.name = get_market_ticker_name(ticker)
+        return df
+
     if adjusted:
-        df = naver.get_market_ohlcv_by_date(fromdate, todate, ticker)
+        df = DataStore().read_adjusted(ticker, fromdate, todate,
+                                       lambda a, b: naver.get_market_ohlcv_by_date(a, b, ticker))
     else:
-        df = krx.get_market_ohlcv_by_date(fromdate, todate, ticker)
+        df = DataStore().read("ohlcv", ticker, fromdate, todate,
+                              lambda a, b: krx.get_market_ohlcv_by_date(a, b, ticker),
+                              _delist_date(ticker))
 
     if name_display:
         df.columns.name = get_market_ticker_name(ticker)
 
-    how = {'시가': 'first', '고가': 'max', '저가': 'min', '종가': 'last',
-           '거래량': 'sum'}
-    return resample_ohlcv(df, freq, how)
+    return resample_ohlcv(df, freq, _OHLCV_HOW)
 
 
+@_output
 def get_market_ohlcv_by_ticker(date, market="ALL"):
     """"
     :param date    : 조회  일자 (YYYYMMDD)
@@ -110,19 +392,32 @@ def get_market_ohlcv_by_ticker(date, market="ALL"):
     return krx.get_market_ohlcv_by_ticker(date, market)
 
 
+@_output
 def get_market_cap_by_date(fromdate, todate, ticker, freq='d'):
+    """일자별 시가총액 조회
+    :param fromdate: 조회 시작 일자 (YYYYMMDD)
+    :param todate  : 조회 종료 일자 (YYYYMMDD)
+    :param ticker  : 조회할 종목의 티커 - 티커 리스트나 "ALL"을 입력하면 (날짜, 티커)
+                     MultiIndex DataFrame을 반환
+    :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
+    :return:
+    """
     if isinstance(fromdate, datetime.datetime):
         fromdate = _datetime2string(fromdate)
 
     if isinstance(todate, datetime.datetime):
         todate = _datetime2string(todate)
 
-    df = krx.get_market_cap_by_date(fromdate, todate, ticker)
+    if _is_multi_ticker(ticker):
+        return _fetch_panel(get_market_cap_by_date, fromdate, todate, ticker, freq=freq)
 
-    how = {'시가총액': 'last', '거래량': 'sum', '거래대금': 'sum', '상장주식수': 'last'}
-    return resample_ohlcv(df, freq, how)
+    df = DataStore().read("cap", ticker, fromdate, todate,
+                          lambda a, b: krx.get_market_cap_by_date(a, b, ticker), _delist_date(ticker))
 
+    return resample_ohlcv(df, freq, _CAP_HOW)
 
+
+@_output
 def get_market_cap_by_ticker(date, market="ALL"):
     if isinstance(date, datetime.datetime):
         date = _datetime2string(date)
@@ -130,6 +425,7 @@ def get_market_cap_by_ticker(date, market="ALL"):
     return krx.get_market_cap_by_ticker(date, market)
 
 
+@_output
 def get_exhaustion_rates_of_foreign_investment_by_ticker(date, market="ALL", balance_limit=False):
     if isinstance(date, datetime.datetime):
         date = _datetime2string(date)
@@ -137,6 +433,7 @@ def get_exhaustion_rates_of_foreign_investment_by_ticker(date, market="ALL", bal
     return krx.get_exhaustion_rates_of_foreign_investment_by_ticker(date, market, balance_limit)
 
 
+@_output
 def get_market_price_change_by_ticker(fromdate, todate):
     if isinstance(fromdate, datetime.datetime):
         fromdate = _datetime2string(fromdate)
@@ -150,12 +447,9 @@ def get_market_price_change_by_ticker(fromdate, todate):
 
     # MKD80037는 상장 폐지 종목은 제외한 정보를 전달하기 때문에, 시작일의 가격
     # 정보 중에서 시가를 가져온다.
-    # - 시작일이 주말일 경우를 고려해서 가까운 미래의 평일의 날짜를 얻어온다.
-    # - 동화약품(000020)은 가장 오래된 상장 회사
-    dt = datetime.date(int(fromdate[:4]), int(fromdate[4:6]), int(fromdate[6:]))
-    dt += datetime.timedelta(days=7)
-    hack = get_market_ohlcv_by_date(fromdate, dt.strftime("%Y%m%d"), "000020")
-    fromdate = hack.index[0].strftime("%Y%m%d")
+    # - 시작일이 휴장일일 경우를 고려해서 가까운 미래의 거래일을 사용한다.
+    if not krx.is_trading_day(fromdate):
+        fromdate = krx.next_trading_day(fromdate)
 
     # - 시작일 하루간의 가격 정보를 얻어온다.
     df_1 = krx.get_market_price_change_by_ticker(fromdate, fromdate)
@@ -169,19 +463,35 @@ def get_market_price_change_by_ticker(fromdate, todate):
         df_1.loc[cond, '거래량'  ] = 0    
         df_1.loc[cond, '거래대금'] = 0
         # 조회 정보에 상장 폐지 정보를 추가한다.    
-        df_a = df_a.append(df_1[cond])
+        df_a = pd.concat([df_a, df_1[cond]])
     return df_a
 
 
+@_output
 def get_market_fundamental_by_date(fromdate, todate, ticker, freq='d', name_display=False):
+    """일자별 DIV/BPS/PER/EPS/PBR 조회
+    :param fromdate: 조회 시작 일자 (YYYYMMDD)
+    :param todate  : 조회 종료 일자 (YYYYMMDD)
+    :param ticker  : 조회할 종목의 티커 - 티커 리스트나 "ALL"을 입력하면 (날짜, 티커)
+                     MultiIndex DataFrame을 반환
+    :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
+    :param name_display : columns의 이름 출력 여부 (True/False)
+    :return:
+    """
     if isinstance(fromdate, datetime.datetime):
         fromdate = _datetime2string(fromdate)
 
     if isinstance(todate, datetime.datetime):
         todate = _datetime2string(todate)
 
-    isin = krx.get_stock_ticker_isin(ticker)
-    df = krx.get_market_fundamental_by_date(fromdate, todate, isin)
+    if _is_multi_ticker(ticker):
+        return _fetch_panel(get_market_fundamental_by_date, fromdate, todate, ticker, freq=freq)
+
+    def fetch(a, b):
+        isin = krx.get_stock_ticker_isin(ticker)
+        return krx.get_market_fundamental_by_date(a, b, isin)
+
+    df = DataStore().read("fundamental", ticker, fromdate, todate, fetch, _delist_date(ticker))
     if df.empty:
         return df
 
@@ -190,11 +500,10 @@ def get_market_fundamental_by_date(fromdate, todate, ticker, freq='d', name_disp
 
     df['PBR'] = df['PER'] * df['EPS'] / df['BPS']
     df.loc[df['BPS'] == 0, 'PBR'] = 0
-    how = {'DIV': 'first', 'BPS': 'first', 'PER': 'first', 'EPS': 'first',
-           'PBR': 'first'}
-    return resample_ohlcv(df, freq, how)
+    return resample_ohlcv(df, freq, _FUNDAMENTAL_HOW)
 
 
+@_output
 def get_market_fundamental_by_ticker(date, market="ALL"):
     if isinstance(date, datetime.datetime):
         date = _datetime2string(date)
@@ -206,13 +515,14 @@ def get_market_fundamental_by_ticker(date, market="ALL"):
     return df
 
 
+@_output
 def get_market_trading_volume_by_date(fromdate, todate, market="KOSPI", on="세션", freq='d'):
     """
     :param fromdate: 조회 시작 일자 (YYYYMMDD)
     :param todate  : 조회 종료 일자 (YYYYMMDD)
     :param market  : KOSPI / KOSDAQ / KONEX
     :param on      : 세션/종류/매수/매도/전체
-    :param freq    : d - 일 / m - 월 / y - 년
+    :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
     :return        : 거래실적(거래량) 추이 DataFrame
     """
     if isinstance(fromdate, datetime.datetime):
@@ -223,20 +533,21 @@ def get_market_trading_volume_by_date(fromdate, todate, market="KOSPI", on="세
     df = krx.get_market_trading_volume_by_date(fromdate, todate, market)
 
     if on == "전체":
-        return resample_ohlcv(df, freq, sum)
+        return resample_ohlcv(df, freq, 'sum')
     else:
         if on not in df.columns.get_level_values(0):
             return None
         df = pd.concat([df['전체'], df[on]], axis=1)
-        return resample_ohlcv(df, freq, sum)
+        return resample_ohlcv(df, freq, 'sum')
 
 
+@_output
 def get_market_trading_value_by_date(fromdate, todate, market="KOSPI", on="세션", freq='d'):
     """
     :param fromdate: 조회 시작 일자 (YYYYMMDD)
     :param todate  : 조회 종료 일자 (YYYYMMDD)
     :param market  : KOSPI / KOSDAQ / KONEX
-    :param freq    : d - 일 / m - 월 / y - 년
+    :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
     :return        : 거래실적(거래대금) 추이 DataFrame
     """
     if isinstance(fromdate, datetime.datetime):
@@ -248,12 +559,13 @@ def get_market_trading_value_by_date(fromdate, todate, market="KOSPI", on="세
     df = krx.get_market_trading_value_by_date(fromdate, todate, market)
 
     if on == "전체":
-        return resample_ohlcv(df, freq, sum)
+        return resample_ohlcv(df, freq, 'sum')
     else:
         df = pd.concat([df['전체'], df[on]], axis=1)
-        return resample_ohlcv(df, freq, sum)
+        return resample_ohlcv(df, freq, 'sum')
 
 
+@_output
 def get_market_trading_value_and_volume_by_ticker(date, market="KOSPI", investor="전체", market_detail="STC"):
     """거래실적 추이 (거래대금)
     :param date           : 조회 일자 (YYMMDD)
@@ -423,12 +735,13 @@ def get_index_portfolio_deposit_file(ticker, date=None):
     return krx.get_index_portfolio_deposit_file(date, ticker)
 
 
+@_output
 def get_index_ohlcv_by_date(fromdate, todate, ticker, freq='d', name_display=False):
     """인덱스 OHLCV 조회
         :param fromdate: 조회 시작 일자 (YYYYMMDD)
         :param todate  : 조회 종료 일자 (YYYYMMDD)
         :param ticker  : 조회할 지표의 티커
-        :param freq    : d - 일 / m - 월 / y - 년
+        :param freq    : d - 일 / w - 주 / m - 월 / q - 분기 / y - 년
         :param name_display : columns의 이름 출력 여부 (True/False)
         :return:
     """
@@ -438,21 +751,23 @@ def get_index_ohlcv_by_date(fromdate, todate, ticker, freq='d', name_display=Fal
     if isinstance(todate, datetime.datetime):
         todate = _datetime2string(todate)
 
-    df = krx.get_index_ohlcv_by_date(fromdate, todate, ticker)
+    df = DataStore().read("index_ohlcv", ticker, fromdate, todate,
+                          lambda a, b: krx.get_index_ohlcv_by_date(a, b, ticker))
 
     if name_display:
         df.columns.name = get_index_ticker_name(ticker)
 
-    how = {'시가': 'first', '고가': 'max', '저가': 'min', '종가': 'last', '거래량': 'sum'}
-    return resample_ohlcv(df, freq, how)
+    return resample_ohlcv(df, freq, _OHLCV_HOW)
 
 
+@_output
 def get_index_status_by_group(date, market="KOSPI"):
     if isinstance(date, datetime.datetime):
         date = _datetime2string(date)
     return krx.get_index_status_by_group(date, market)
 
 
+@_output
 def get_index_price_change_by_name(fromdate, todate, market="KOSPI"):
     if isinstance(fromdate, datetime.datetime):
         fromdate = _datetime2string(fromdate)
@@ -465,11 +780,13 @@ def get_index_price_change_by_name(fromdate, todate, market="KOSPI"):
 # 공매도(SHORTING) API
 # -----------------------------------------------------------------------------
 
+@_output
 def get_shorting_status_by_date(fromdate, todate, ticker):
     isin = krx.get_stock_ticker_isin(ticker)
     return krx.get_shorting_status_by_date(fromdate, todate, isin)
 
 
+@_output
 def get_shorting_volume_by_ticker(date, market="KOSPI"):
     if isinstance(date, datetime.datetime):
         date = _datetime2string(date)
@@ -477,6 +794,7 @@ def get_shorting_volume_by_ticker(date, market="KOSPI"):
     return krx.get_shorting_volume_by_ticker(date, market)
 
 
+@_output
 def get_shorting_volume_by_date(fromdate, todate, ticker, market="KOSPI"):
     if isinstance(fromdate, datetime.datetime):
         fromdate = _datetime2string(fromdate)
@@ -487,24 +805,29 @@ def get_shorting_volume_by_date(fromdate, todate, ticker, market="KOSPI"):
     return krx.get_shorting_volume_by_date(fromdate, todate, isin, market)
 
 
+@_output
 def get_shorting_investor_volume_by_date(fromdate, todate, market):
     return krx.get_shorting_investor_by_date(fromdate, todate, market, "거래량")
 
 
+@_output
 def get_shorting_investor_price_by_date(fromdate, todate, market):
     return krx.get_shorting_investor_by_date(fromdate, todate, market, "거래대금")
 
 
+@_output
 def get_shorting_volume_top50(date, market):
     return krx.get_shorting_volume_top50(date, market)
 
 
+@_output
 def get_shorting_balance_by_date(fromdate, todate, ticker):
     isin = krx.get_stock_ticker_isin(ticker)
     mark = krx.get_stock_market_from(ticker)
     return krx.get_shorting_balance_by_date(fromdate, todate, isin, mark)
 
 
+@_output
 def get_shorting_balance_top50(date, market):
     return krx.get_shorting_balance_top50(date, market)
 
@@ -522,20 +845,24 @@ def get_etf_isin(ticker):
     return krx.get_etf_isin(ticker)
 
 
+@_output
 def get_etf_ohlcv_by_date(fromdate, todate, ticker):
     return krx.get_etf_ohlcv_by_date(fromdate, todate, ticker)
 
 
+@_output
 def get_etf_portfolio_deposit_file(ticker, date=None):
     if date is None:
         date = get_nearest_business_day_in_a_week()
     return krx.get_etf_portfolio_deposit_file(ticker, date)
 
 
+@_output
 def get_etf_price_deviation(fromdate, todate, ticker):
     return krx.get_etf_price_deviation(fromdate, todate, ticker)
 
 
+@_output
 def get_etf_tracking_error(fromdate, todate, ticker):
     return krx.get_etf_tracking_error(fromdate, todate, ticker)
 
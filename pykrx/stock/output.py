@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_string_dtype
+
+PROFILES = ("default", "safe", "compact")
+FORMATS = ("pandas", "arrow", "polars")
+
+
+def _convert(s, profile):
+    kind = s.dtype.kind
+    if kind in 'iu':
+        if profile == "safe":
+            return s.astype(np.int64)
+        # 실제 값의 범위에 맞는 정수형 - 가격/거래량끼리의 연산이 바로 넘치지 않도록 int32 보다
+        # 작게 줄이지 않는다
+        s = pd.to_numeric(s, downcast='integer')
+        return s.astype(np.int32) if s.dtype.itemsize < 4 else s
+    if kind == 'f':
+        if profile == "safe":
+            return s.astype(np.float64)
+        if s.dtype.itemsize > 4:
+            compact = s.astype(np.float32)
+            # float32로 표현할 수 없는 값이 있으면 그대로 둔다
+            if np.allclose(compact.values, s.values, rtol=1e-6, atol=0, equal_nan=True):
+                return compact
+        return s
+    if profile == "compact" and (kind == 'O' or is_string_dtype(s.dtype)):
+        return s.astype('category')
+    return s
+
+
+def apply_dtype_profile(df, profile):
+    """DataFrame의 dtype을 profile에 맞게 변환
+    :param df     : DataFrame 또는 Series
+    :param profile: default - 변환하지 않음
+                    safe    - 정수는 int64, 실수는 float64로 넓혀서 overflow를 막는다
+                    compact - 문자열(종목명, 시장 등)은 category, 정수는 값이 int32 범위에
+                              있으면 int32, 실수는 정밀도가 허용되면 float32
+                              int32 컬럼의 곱셈/누적합(거래대금, 수익률 계산 등)은 경고 없이
+                              넘칠 수 있으므로 계산 전에 int64 로 변환해야 한다
+    :return       : 변환된 DataFrame 또는 Series
+    """
+    if profile == "default":
+        return df
+    if isinstance(df, pd.Series):
+        return _convert(df, profile)
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+    columns = [_convert(df.iloc[:, i], profile) for i in range(df.shape[1])]
+    result = pd.concat(columns, axis=1)
+    result.columns = df.columns
+    return result
+
+
+def to_format(df, fmt):
+    """DataFrame을 요청한 형식으로 변환
+    Arrow와 Polars에는 index가 없으므로 index(날짜, 티커 등)는 컬럼이 된다.
+    숫자 컬럼은 가능하면 NumPy 버퍼를 복사하지 않고 그대로 사용한다.
+    :param df : DataFrame 또는 Series
+    :param fmt: pandas / arrow (pyarrow.Table) / polars (polars.DataFrame)
+    :return   : 변환된 결과
+    """
+    if fmt not in FORMATS:
+        raise ValueError("choose an output format in {}".format(FORMATS))
+    if fmt == "pandas" or not isinstance(df, (pd.DataFrame, pd.Series)):
+        return df
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = ["_".join(str(x) for x in column if x != "") for column in df.columns]
+    if not df.empty:
+        df = df.reset_index()
+
+    if fmt == "arrow":
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("output='arrow' requires pyarrow (pip install pyarrow)")
+        return pyarrow.Table.from_pandas(df, preserve_index=False)
+    try:
+        import polars
+    except ImportError:
+        raise ImportError("output='polars' requires polars (pip install polars)")
+    return polars.from_pandas(df)
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import datetime
+import warnings
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pykrx.website.comm import singleton
+from pykrx.website.comm.util import cache_file, file_lock, write_file, write_json, split_date_range
+from pykrx.website.krx.calendar import trading_days, CalendarError
+
+try:
+    import pyarrow  # noqa: F401
+    _FORMAT = "parquet"
+except ImportError:
+    try:
+        import fastparquet  # noqa: F401
+        _FORMAT = "parquet"
+    except ImportError:
+        # parquet 엔진이 설치되지 않은 경우 pickle로 저장
+        _FORMAT = "pickle"
+
+
+def _to_date(text):
+    return datetime.datetime.strptime(text, "%Y%m%d").date()
+
+
+def _to_text(date):
+    return date.strftime("%Y%m%d")
+
+
+def _subtract(covered, fromdate, todate):
+    """[fromdate, todate] 중 covered 구간에 포함되지 않은 구간 리스트"""
+    missing = []
+    start = _to_date(fromdate)
+    end = _to_date(todate)
+    for a, b in covered:
+        a, b = _to_date(a), _to_date(b)
+        if b < start:
+            continue
+        if a > end:
+            break
+        if a > start:
+            missing.append((_to_text(start), _to_text(a - datetime.timedelta(days=1))))
+        start = max(start, b + datetime.timedelta(days=1))
+    if start <= end:
+        missing.append((_to_text(start), _to_text(end)))
+    return missing
+
+
+def _merge(covered, fromdate, todate):
+    """covered 구간에 [fromdate, todate]를 추가하고 겹치거나 이어지는 구간을 합친다"""
+    intervals = sorted([(_to_date(a), _to_date(b)) for a, b in covered] +
+                       [(_to_date(fromdate), _to_date(todate))])
+    merged = [list(intervals[0])]
+    for a, b in intervals[1:]:
+        if a <= merged[-1][1] + datetime.timedelta(days=1):
+            merged[-1][1] = max(merged[-1][1], b)
+        else:
+            merged.append([a, b])
+    return [[_to_text(a), _to_text(b)] for a, b in merged]
+
+
+@singleton
+class DataStore:
+    """일자별 데이터를 보관하는 로컬 저장소
+
+    데이터는 <root>/<dataset>/<연도>/<티커>.parquet 파일에 저장되고, 이미 조회한
+    기간은 <root>/<dataset>/coverage/<티커>.json에 기록된다. 조회 요청은 저장소에서
+    처리하며 저장되지 않은 기간만 KRX에서 가져와서 추가한다. 오늘 데이터는 장중에
+    바뀔 수 있으므로 저장하지 않는다. 과거 값이 바뀌는 수정주가는 read_adjusted 로
+    <root>/adjusted/<티커> 에 따로 보관한다.
+    """
+    # 수정주가를 다시 확인하지 않고 재사용하는 시간 (초)
+    adjusted_ttl = 600
+    # 수정주가 갱신 시 저장된 데이터와 비교하는 최근 봉의 개수
+    adjusted_overlap = 5
+
+    def __init__(self, path=None):
+        self.enabled = True
+        self.path = path
+        self._lock = threading.RLock()
+        self._locks = {}
+
+    def configure(self, enabled=None, path=None):
+        if enabled is not None:
+            self.enabled = enabled
+        if path is not None:
+            self.path = path
+
+    def read_adjusted(self, ticker, fromdate, todate, fetch):
+        """수정주가를 종목별 전체 이력으로 보관하고 최근 구간만 받아서 갱신한다
+
+        액면분할, 배당 등이 발생하면 과거의 수정주가가 모두 바뀐다. 저장된 마지막
+        봉 몇 개를 포함한 최근 구간을 받아서 겹치는 봉의 가격이 같으면 새 봉만
+        추가하고, 다르면 수정주가가 바뀐 것이므로 전체 이력을 다시 받는다. 조회에
+        실패하거나 빈 결과를 받으면 저장된 이력을 그대로 반환한다.
+        :param ticker  : 티커
+        :param fromdate: 조회 시작 일자 (YYYYMMDD)
+        :param todate  : 조회 종료 일자 (YYYYMMDD)
+        :param fetch   : fetch(fromdate, todate) - 날짜 index를 갖는 OHLCV DataFrame을 반환
+        :return        : 날짜 순으로 정렬된 DataFrame
+        """
+        if not self.enabled:
+            return fetch(fromdate, todate)
+
+        today = _to_text(datetime.date.today())
+        # 같은 종목의 요청만 기다리고 다른 종목의 조회는 동시에 진행한다
+        with self._ticker_lock("adjusted", ticker):
+            meta = self._meta(ticker)
+            path = self._adjusted_file(ticker)
+            df = _read(path) if meta is not None and os.path.exists(path) else None
+
+            if df is None or df.empty or fromdate < meta["start"]:
+                start = fromdate if meta is None else min(fromdate, meta["start"])
+                history = fetch(start, today)
+                if history.empty and df is not None:
+                    start = None
+                else:
+                    df = history
+            elif todate >= today or time.time() - meta["checked"] > self.adjusted_ttl:
+                start = meta["start"]
+                tail = _fetch_tail(fetch, df, self.adjusted_overlap, today)
+                if tail is None:
+                    # 최근 구간을 받지 못하면 저장된 이력을 그대로 사용하고 다음 조회에서 다시 확인한다
+                    start = None
+                elif _is_continued(df, tail):
+                    df = pd.concat([df, tail.loc[tail.index > df.index[-1]]])
+                else:
+                    history = fetch(start, today)
+                    if history.empty:
+                        warnings.warn("failed to refetch adjusted prices of {}; "
+                                      "using the stored history".format(ticker))
+                        start = None
+                    else:
+                        df = history
+            else:
+                start = None
+
+            if start is not None and not df.empty:
+                # 오늘 봉은 장중에 바뀔 수 있으므로 저장하지 않는다
+                _write(df.loc[df.index < pd.Timestamp(today)], path)
+                self._write_meta(ticker, {"start": start, "checked": time.time()})
+
+        if df.empty:
+            return df
+        return df.loc[(_to_date(fromdate) <= df.index.date) & (df.index.date <= _to_date(todate))]
+
+    def read(self, dataset, ticker, fromdate, todate, fetch, delisted=None):
+        """저장소에서 데이터를 조회하고 없는 기간은 fetch로 채운다
+        :param dataset : 데이터셋 이름 (예: ohlcv)
+        :param ticker  : 티커
+        :param fromdate: 조회 시작 일자 (YYYYMMDD)
+        :param todate  : 조회 종료 일자 (YYYYMMDD)
+        :param fetch   : fetch(fromdate, todate) - 날짜 index를 갖는 DataFrame을 반환
+        :param delisted: delisted() - 상폐일(YYYYMMDD), 상장 종목은 None
+                         빈 결과가 상폐 이후의 구간인지 확인할 때만 호출한다
+        :return        : 날짜 순으로 정렬된 DataFrame
+        """
+        if not self.enabled:
+            return fetch(fromdate, todate)
+
+        today = datetime.date.today()
+        settled = _to_text(min(_to_date(todate), today - datetime.timedelta(days=1)))
+        if fromdate <= settled:
+            # 없는 기간을 연 단위로 나눠서 조회하고 끝난 구간부터 저장한다
+            ranges = []
+            for a, b in _subtract(self._coverage(dataset, ticker), fromdate, settled):
+                ranges.extend(split_date_range(a, b, "Y"))
+            error = None
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = {executor.submit(fetch, a, b): (a, b) for a, b in ranges}
+                for future in as_completed(futures):
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        # 실패한 구간은 기록하지 않고 성공한 구간을 모두 저장한 뒤 알린다
+                        error = error or e
+                        continue
+                    # 과부하로 인한 빈 응답과 구분할 수 있도록 데이터가 없다는 것이
+                    # 확인된 빈 구간만 기록하고 나머지는 다음 조회에서 다시 받는다
+                    if not df.empty or _is_closed(*futures[future], delisted):
+                        self._append(dataset, ticker, df, *futures[future])
+            if error is not None:
+                raise error
+
+        df = self._load(dataset, ticker, fromdate, settled) if fromdate <= settled else None
+        if todate > settled:
+            live = fetch(max(fromdate, _to_text(today)), todate)
+            if not live.empty:
+                df = live if df is None else pd.concat([df, live])
+        return pd.DataFrame() if df is None else df
+
+    def _append(self, dataset, ticker, df, fromdate, todate):
+        # 같은 저장소를 사용하는 다른 프로세스와 연도 파일/조회 구간을 함께 고쳐 쓰지 않도록 잠근다
+        with self._ticker_lock(dataset, ticker), file_lock(self._coverage_file(dataset, ticker)):
+            years = df.groupby(df.index.year) if not df.empty else []
+            for year, chunk in years:
+                path = self._file(dataset, year, ticker)
+                if os.path.exists(path):
+                    chunk = pd.concat([_read(path), chunk])
+                    chunk = chunk[~chunk.index.duplicated(keep='last')]
+                _write(chunk.sort_index(), path)
+
+            covered = _merge(self._coverage(dataset, ticker), fromdate, todate)
+            write_json(self._coverage_file(dataset, ticker), covered)
+
+    def _ticker_lock(self, dataset, ticker):
+        with self._lock:
+            lock = self._locks.get((dataset, ticker))
+            if lock is None:
+                lock = self._locks[(dataset, ticker)] = threading.Lock()
+            return lock
+
+    def _load(self, dataset, ticker, fromdate, todate):
+        frames = []
+        for year in range(int(fromdate[:4]), int(todate[:4]) + 1):
+            path = self._file(dataset, year, ticker, create=False)
+            if os.path.exists(path):
+                frames.append(_read(path))
+        if len(frames) == 0:
+            return None
+        df = pd.concat(frames)
+        return df.loc[(_to_date(fromdate) <= df.index.date) & (df.index.date <= _to_date(todate))]
+
+    def _coverage(self, dataset, ticker):
+        path = self._coverage_file(dataset, ticker)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def _file(self, dataset, year, ticker, create=True):
+        return cache_file(self.path, "store", dataset, str(year), "{}.{}".format(ticker, _FORMAT),
+                          create=create)
+
+    def _meta(self, ticker):
+        path = self._adjusted_file(ticker, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, ticker, meta):
+        write_json(self._adjusted_file(ticker, "json"), meta)
+
+    def _adjusted_file(self, ticker, ext=_FORMAT):
+        return cache_file(self.path, "store", "adjusted", "{}.{}".format(ticker, ext))
+
+    def _coverage_file(self, dataset, ticker):
+        return cache_file(self.path, "store", dataset, "coverage", "{}.json".format(ticker))
+
+
+def _is_closed(fromdate, todate, delisted):
+    """[fromdate, todate] 에 데이터가 없다는 것을 확인 - 거래일이 없거나 상폐 이후의 구간"""
+    try:
+        if len(trading_days(fromdate, todate)) == 0:
+            return True
+    except CalendarError:
+        pass
+    if delisted is None:
+        return False
+    dd = delisted()
+    return dd is not None and fromdate > dd
+
+
+def _fetch_tail(fetch, cached, overlap, today):
+    """저장된 마지막 overlap 개의 봉부터 오늘까지 조회 - 실패하거나 겹치는 봉이 없으면 None"""
+    try:
+        tail = fetch(_to_text(cached.index[-overlap:][0]), today)
+    except Exception as e:
+        warnings.warn("failed to refresh adjusted prices: {}".format(e))
+        return None
+    if len(cached.index.intersection(tail.index)) == 0:
+        warnings.warn("failed to refresh adjusted prices: no overlapping bars")
+        return None
+    return tail
+
+
+def _is_continued(cached, tail):
+    """저장된 수정주가와 새로 받은 최근 구간의 겹치는 봉이 같은 가격(비율 1)인지 확인"""
+    overlap = cached.index.intersection(tail.index)
+    columns = ['시가', '고가', '저가', '종가']
+    # 거래 정지일의 0 가격 때문에 비율 대신 값을 직접 비교한다
+    return bool(np.array_equal(tail.loc[overlap, columns].values,
+                               cached.loc[overlap, columns].values))
+
+
+def _read(path):
+    if _FORMAT == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _write(df, path):
+    write_file(path, df.to_parquet if _FORMAT == "parquet" else df.to_pickle)
@@ -0,0 +1,215 @@
+import os
+import json
+import time
+import bisect
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+from pykrx.website.comm import singleton
+from pykrx.website.comm.util import cache_file, write_json
+
+
+def _weekdays(fromdate, todate):
+    """[fromdate, todate] 구간의 평일 리스트 (YYYYMMDD)"""
+    if fromdate > todate:
+        return []
+    return [d.strftime("%Y%m%d") for d in pd.bdate_range(fromdate, todate)]
+
+
+def _today():
+    return datetime.date.today().strftime("%Y%m%d")
+
+
+def _next_day(date, days=1):
+    date = datetime.datetime.strptime(date, "%Y%m%d") + datetime.timedelta(days=days)
+    return date.strftime("%Y%m%d")
+
+
+class _History:
+    """시장 하나의 날짜별 상장 종목 스냅샷
+
+    파일에는 첫 스냅샷 전체와 이후 스냅샷의 (추가, 제거) 차이만 저장한다.
+    """
+    def __init__(self):
+        self.dates = []
+        self.snapshots = {}
+        # 휴장일 - 조회 오류와 구분할 수 없으므로 파일에 저장하지 않는다
+        self.closed = set()
+        # 오늘의 (날짜, 조회 시각, 티커) - 장중에 바뀔 수 있으므로 스냅샷으로 저장하지 않는다
+        self.live = None
+
+    def add(self, date, tickers):
+        if date not in self.snapshots:
+            bisect.insort(self.dates, date)
+        self.snapshots[date] = frozenset(tickers)
+
+    def neighbors(self, date):
+        """date 이전(같은 날 포함)과 이후의 가장 가까운 스냅샷 날짜"""
+        i = bisect.bisect_right(self.dates, date)
+        prev = self.dates[i - 1] if i > 0 else None
+        succ = self.dates[i] if i < len(self.dates) else None
+        return prev, succ
+
+    def to_json(self):
+        if len(self.dates) == 0:
+            return {"dates": [], "base": [], "diffs": []}
+        diffs = []
+        for a, b in zip(self.dates[:-1], self.dates[1:]):
+            before, after = self.snapshots[a], self.snapshots[b]
+            diffs.append([sorted(after - before), sorted(before - after)])
+        return {"dates": self.dates, "base": sorted(self.snapshots[self.dates[0]]), "diffs": diffs}
+
+    @classmethod
+    def from_json(cls, data):
+        history = cls()
+        if len(data["dates"]) == 0:
+            return history
+        tickers = set(data["base"])
+        history.add(data["dates"][0], tickers)
+        for date, (added, removed) in zip(data["dates"][1:], data["diffs"]):
+            tickers = (tickers | set(added)) - set(removed)
+            history.add(date, tickers)
+        return history
+
+
+@singleton
+class UniverseHistory:
+    """시장별 상장 종목 이력
+
+    KRX에서 받은 날짜별 상장 종목 스냅샷을 <root>/<시장>.json 에 차이만 저장한다.
+    조회일이 두 스냅샷 사이에 있으면 양쪽에 모두 있는 종목은 그대로 상장된 것으로
+    보고, 사라진 종목은 상폐일로 판단한다. 상장일을 알 수 없는 신규 종목이나 상폐일이
+    없는 종목(시장 이전 등)이 있을 때만 구간의 가운데 날짜 스냅샷을 받아서 구간을
+    반으로 줄인다. 한 번 받은 스냅샷은 다시 받지 않는다. 오늘의 목록은 장중에 바뀔
+    수 있으므로 스냅샷으로 저장하지 않고 ttl 초 동안만 기억한다.
+    """
+    # 오늘의 목록을 다시 받기까지의 시간 (초)
+    ttl = 600
+
+    def __init__(self, path=None):
+        self.path = path
+        self._histories = {}
+        self._lock = threading.RLock()
+
+    def configure(self, path=None):
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._histories = {}
+
+    def tickers(self, date, market, fetch, delist, days=_weekdays):
+        """date 에 상장된 티커 리스트
+        :param date  : 조회 일자 (YYYYMMDD)
+        :param market: 시장 이름 - 시장마다 따로 저장한다
+        :param fetch : fetch(date) - KRX에서 조회한 date 의 티커 리스트 (휴장일은 빈 리스트)
+        :param delist: delist(tickers) - {티커: 상폐일(YYYYMMDD)} 상폐일을 모르는 종목은 제외
+        :param days  : days(fromdate, todate) - 구간의 거래일 리스트 (기본값은 평일)
+        :return      : 정렬된 티커 리스트
+        """
+        with self._lock:
+            history = self._history(market)
+            count = len(history.dates)
+            members = self._members(history, date, fetch, delist, days)
+            if len(history.dates) != count:
+                self._save(market, history)
+        return sorted(members)
+
+    def membership(self, fromdate, todate, market, fetch, delist, days=_weekdays):
+        """기간 동안의 일자별 상장 여부
+        :return: 날짜 x 티커의 bool DataFrame - 휴장일은 포함하지 않는다
+        """
+        with self._lock:
+            history = self._history(market)
+            count = len(history.dates)
+            dates = days(fromdate, todate)
+            # 구간의 양 끝 스냅샷을 먼저 받아야 사이의 날짜를 나눠서 찾을 수 있다
+            # 오늘은 스냅샷으로 저장하지 않으므로 끝으로 사용할 수 없다
+            today = _today()
+            for date in reversed([d for d in dates if d < today]):
+                if len(self._members(history, date, fetch, delist, days)) > 0:
+                    break
+            rows = []
+            for date in dates:
+                members = self._members(history, date, fetch, delist, days)
+                # 휴장일과 아직 장이 열리지 않은 오늘은 목록이 비어 있다
+                if len(members) > 0:
+                    rows.append((date, members))
+            if len(history.dates) != count:
+                self._save(market, history)
+
+        tickers = sorted(set().union(*[members for _, members in rows]))
+        position = {ticker: i for i, ticker in enumerate(tickers)}
+        matrix = np.zeros((len(rows), len(tickers)), dtype=bool)
+        for i, (_, members) in enumerate(rows):
+            matrix[i, [position[ticker] for ticker in members]] = True
+        index = pd.to_datetime([date for date, _ in rows], format="%Y%m%d")
+        return pd.DataFrame(matrix, index=pd.DatetimeIndex(index, name='날짜'),
+                            columns=pd.Index(tickers, name='티커'))
+
+    def _members(self, history, date, fetch, delist, days):
+        if date in history.closed or len(days(date, date)) == 0:
+            return frozenset()
+        if date >= _today():
+            return self._live(history, date, fetch)
+
+        while True:
+            prev, succ = history.neighbors(date)
+            if prev == date:
+                return history.snapshots[date]
+            if prev is None or succ is None:
+                # 저장된 스냅샷 범위 밖은 보간할 수 없으므로 그 날짜를 받는다
+                return self._fetch(history, date, fetch)
+
+            before, after = history.snapshots[prev], history.snapshots[succ]
+            members = set(before & after)
+            unresolved = len(after - before) > 0
+            removed = before - after
+            if len(removed) > 0:
+                dates = delist(sorted(removed))
+                for ticker in removed:
+                    dd = dates.get(ticker)
+                    if dd is None or not prev < dd <= succ:
+                        unresolved = True
+                    elif date < dd:
+                        members.add(ticker)
+            if not unresolved:
+                return frozenset(members)
+
+            candidates = [d for d in days(_next_day(prev), _next_day(succ, -1))
+                          if d not in history.closed]
+            if len(candidates) == 0:
+                return before
+            self._fetch(history, candidates[len(candidates) // 2], fetch)
+
+    def _live(self, history, date, fetch):
+        live = history.live
+        if live is None or live[0] != date or time.time() - live[1] > self.ttl:
+            live = history.live = (date, time.time(), frozenset(fetch(date)))
+        return live[2]
+
+    def _fetch(self, history, date, fetch):
+        tickers = fetch(date)
+        if len(tickers) == 0:
+            history.closed.add(date)
+            return frozenset()
+        history.add(date, tickers)
+        return history.snapshots[date]
+
+    def _history(self, market):
+        history = self._histories.get(market)
+        if history is None:
+            path = self._file(market)
+            if os.path.exists(path):
+                with open(path) as f:
+                    history = _History.from_json(json.load(f))
+            else:
+                history = _History()
+            self._histories[market] = history
+        return history
+
+    def _save(self, market, history):
+        write_json(self._file(market), history.to_json())
+
+    def _file(self, market):
+        return cache_file(self.path, "universe", "{}.json".format(market))
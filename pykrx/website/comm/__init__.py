@@ -1,3 +1,10 @@
-from pykrx.website.comm.util import dataframe_empty_handler, singleton
+from pykrx.website.comm.util import dataframe_empty_handler, singleton, chunked
+from pykrx.website.comm.webio import SessionPool, ThreadedExecutor
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.retry import RequestPolicy, CircuitOpenError
+from pykrx.website.comm.cache import ResponseCache
+from pykrx.website.comm.singleflight import SingleFlight
 
-__all__ = ['dataframe_empty_handler', 'singleton']
+__all__ = ['dataframe_empty_handler', 'singleton', 'chunked', 'SessionPool', 'ThreadedExecutor',
+           'RateLimiter', 'RequestPolicy', 'CircuitOpenError', 'ResponseCache',
+           'SingleFlight']
@@ -0,0 +1,126 @@
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import datetime
+import threading
+from pykrx.website.comm.util import singleton, get_cache_dir
+
+
+@singleton
+class ResponseCache:
+    """요청 결과를 압축해서 저장하는 디스크 캐시
+
+    키는 url / bld / 정규화된 파라미터의 해시 값이며 OTP 코드는 포함하지 않는다.
+    - 조회 기간이 오늘 이전에 끝나는 응답은 바뀌지 않으므로 만료되지 않는다
+    - 오늘이 포함되거나 날짜 파라미터가 없는 응답은 ttl 초 동안만 유효하다
+    저장 용량이 max_size 바이트를 넘으면 가장 오래 전에 사용된 항목부터 지운다.
+    """
+    def __init__(self, path=None, max_size=512 * 1024 * 1024, ttl=600):
+        self.enabled = True
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled=None, path=None, max_size=None, ttl=None):
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if path is not None and path != self.path:
+                self._close()
+                self.path = path
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl is not None:
+                self.ttl = ttl
+
+    @staticmethod
+    def key(url, bld, params):
+        params = {k: v for k, v in params.items() if k != "code"}
+        text = json.dumps([url, bld, sorted(params.items())], ensure_ascii=False, default=str)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def expires(self, params, settle_days=0):
+        """파라미터의 마지막 날짜를 기준으로 만료 시각을 계산
+        :param params     : 요청 파라미터
+        :param settle_days: 확정되기까지 걸리는 일 수 (예: 공매도 T+2)
+        :return           : 만료 시각 - 만료되지 않으면 None
+        """
+        dates = [v for v in params.values() if isinstance(v, str) and re.fullmatch(r"\d{8}", v)]
+        if len(dates) > 0:
+            settled = datetime.date.today() - datetime.timedelta(days=settle_days)
+            if max(dates) < settled.strftime("%Y%m%d"):
+                return None
+        return time.time() + self.ttl
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT data, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] < time.time()):
+                self.misses += 1
+                return None
+            self._db().execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def set(self, key, data, expires=None):
+        if not self.enabled:
+            return
+        blob = zlib.compress(data)
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                       (key, blob, expires, time.time(), len(blob)))
+            self._evict(db)
+
+    def stats(self):
+        """캐시 사용 통계"""
+        with self._lock:
+            entries, size = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": entries, "size": size}
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+
+    def _evict(self, db):
+        size = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if size <= self.max_size:
+            return
+        rows = db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        victims = []
+        for key, length in rows:
+            if size <= self.max_size:
+                break
+            victims.append((key,))
+            size -= length
+        db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def _db(self):
+        if self._conn is None:
+            path = self.path or os.path.join(get_cache_dir(), "responses.sqlite")
+            self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                               "data BLOB, expires REAL, accessed REAL, size INTEGER)")
+        return self._conn
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from pandas.api.types import is_numeric_dtype
+
+
+def parse_number(values, dtype=np.int64, fill=0):
+    """KRX 숫자 문자열을 dtype 의 숫자로 변환
+    - 천 단위 구분자(,)는 제거한다
+    - 빈 문자열, '-', 공백처럼 숫자가 아닌 값은 fill 로 채운다
+    :param values: Series 또는 리스트
+    :param dtype : 변환할 numpy dtype
+    :param fill  : 숫자가 아닌 값을 채울 값
+    :return      : dtype 의 Series
+    :raises OverflowError: 정수 dtype 의 범위를 벗어나는 값이 있을 때
+    """
+    if not is_numeric_dtype(values):
+        # 문자열이 아닌 값(숫자, NaN)은 그대로 두고 to_numeric 이 한 번에 변환한다
+        text = [x.replace(',', '') if isinstance(x, str) else x for x in values]
+        index = values.index if isinstance(values, pd.Series) else None
+        values = pd.Series(pd.to_numeric(text, errors='coerce'), index=index)
+    if values.isna().any():
+        values = values.fillna(fill)
+    if np.issubdtype(dtype, np.integer) and len(values) > 0:
+        # astype 은 범위를 벗어난 값을 경고 없이 잘라내므로 먼저 확인한다
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise OverflowError("values out of {} range: [{}, {}]".format(
+                np.dtype(dtype).name, values.min(), values.max()))
+    return values.astype(dtype)
+
+
+def parse_date(values, format='%Y%m%d'):
+    """'2019/03/29' 또는 '20190329' 형태의 날짜 문자열을 datetime 으로 변환
+    :param values: Series 또는 Index
+    :return      : values 와 같은 형태의 datetime
+    """
+    return pd.to_datetime(values.str.replace('/', '', regex=False), format=format)
+
+
+def parse_frame(df, dtypes, fill=0):
+    """DataFrame 의 숫자 컬럼을 컬럼 단위로 한 번에 변환
+    :param df    : KRX 에서 받은 문자열 DataFrame
+    :param dtypes: {컬럼: dtype} - dtype 하나만 입력하면 모든 컬럼에 적용
+    :param fill  : 숫자가 아닌 값을 채울 값
+    :return      : 변환된 DataFrame - dtypes 에 없는 컬럼은 그대로 둔다
+    """
+    if not isinstance(dtypes, dict):
+        dtypes = {column: dtypes for column in df.columns}
+    df = df.copy()
+    for column, dtype in dtypes.items():
+        df[column] = parse_number(df[column], dtype, fill)
+    return df
+
+
+def records_to_frame(records, columns=None):
+    """JSON 레코드(dict 리스트)에서 필요한 키만 컬럼 단위로 꺼내서 DataFrame 생성
+    :param records: dict 리스트
+    :param columns: {키: dtype} - dtype 이 str 인 컬럼은 문자열 그대로 둔다
+                    입력하지 않으면 모든 키를 문자열 컬럼으로 만든다
+    :return       : columns 순서의 DataFrame
+    """
+    if columns is None:
+        return DataFrame(records)
+    data = {}
+    for key, dtype in columns.items():
+        values = [record[key] for record in records]
+        data[key] = values if dtype is str else parse_number(values, dtype)
+    return DataFrame(data, columns=list(columns))
@@ -0,0 +1,125 @@
+import time
+import threading
+from urllib.parse import urlsplit
+from pykrx.website.comm.util import singleton
+
+
+class TokenBucket:
+    """초당 rate 개의 토큰이 채워지는 token bucket"""
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰을 하나 꺼낸다 - 토큰이 없으면 채워질 때까지 기다린다"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveLimiter:
+    """호스트 하나의 요청 속도와 동시 요청 수를 제어
+
+    초당 요청 수는 token bucket 으로 제한하고, 동시 요청 수는 AIMD 로 조절한다.
+    - 현재 한도만큼의 요청이 연속으로 성공하면 한도를 1 늘린다 (additive increase)
+    - 요청이 실패하거나 응답 시간이 기준의 slow 배를 넘으면 한도를 절반으로 줄인다
+      (multiplicative decrease)
+    """
+    def __init__(self, rate=10, concurrency=4, max_concurrency=32, slow=4.0):
+        self.bucket = TokenBucket(rate)
+        self.limit = concurrency
+        self.max_concurrency = max_concurrency
+        self.slow = slow
+        self.latency = None
+        self._baseline = None
+        self._active = 0
+        self._successes = 0
+        self._decreased = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        self.bucket.acquire()
+
+    def release(self, latency, ok=True):
+        """요청 결과를 반영해서 동시 요청 수의 한도를 조절
+        :param latency: 요청에 걸린 시간 (초)
+        :param ok     : 요청 성공 여부
+        """
+        with self._cond:
+            self._active -= 1
+            if ok:
+                self._update_latency(latency)
+            if not ok or latency > self._baseline * self.slow:
+                self._decrease()
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def decrease(self):
+        """서버가 과부하 신호(오류 페이지 등)를 보냈을 때 호출"""
+        with self._cond:
+            self._decrease()
+
+    def _update_latency(self, latency):
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self._baseline = self.latency if self._baseline is None else min(self._baseline, self.latency)
+
+    def _decrease(self):
+        # 동시에 실패한 요청들이 한도를 연달아 줄이지 않도록 응답 시간 동안은 한 번만 줄인다
+        now = time.monotonic()
+        if now - self._decreased < (self.latency or 0):
+            return
+        self._decreased = now
+        self._successes = 0
+        self.limit = max(1, self.limit // 2)
+
+
+@singleton
+class RateLimiter:
+    """호스트별 AdaptiveLimiter 모음"""
+    hosts = {
+        "marketdata.krx.co.kr"  : {"rate": 10, "concurrency": 4},
+        "file.krx.co.kr"        : {"rate": 5, "concurrency": 2},
+        "short.krx.co.kr"       : {"rate": 5, "concurrency": 2},
+        "fchart.stock.naver.com": {"rate": 20, "concurrency": 8},
+    }
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host, **kwargs):
+        """호스트의 제한 값을 지정
+        :param host  : 호스트 이름 (예: marketdata.krx.co.kr)
+        :param kwargs: rate / concurrency / max_concurrency / slow
+        """
+        with self._lock:
+            self.hosts = dict(self.hosts)
+            self.hosts[host] = dict(self.hosts.get(host, {}), **kwargs)
+            self._limiters.pop(host, None)
+
+    def get(self, url):
+        host = urlsplit(url).hostname
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = AdaptiveLimiter(**self.hosts.get(host, {}))
+                self._limiters[host] = limiter
+            return limiter
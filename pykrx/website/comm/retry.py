@@ -0,0 +1,129 @@
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+from pykrx.website.comm.util import singleton
+
+
+class CircuitOpenError(IOError):
+    """장애가 감지된 endpoint 로의 요청을 보내지 않고 실패시킬 때 발생"""
+    pass
+
+
+class RetryPolicy:
+    """endpoint 하나의 timeout 과 재시도 정책
+    :param timeout          : (연결, 읽기) timeout 초
+    :param retries          : 일시적인 실패를 재시도하는 최대 횟수
+    :param backoff          : 첫 재시도의 최대 대기 시간 (초) - 재시도마다 두 배로 늘어난다
+    :param max_backoff      : 재시도 대기 시간의 상한 (초)
+    :param failure_threshold: circuit breaker 가 열리는 연속 실패 횟수
+    :param reset_timeout    : 열린 circuit breaker 가 다시 요청을 시도하기까지의 시간 (초)
+    """
+    def __init__(self, timeout=(3.05, 30), retries=3, backoff=0.5, max_backoff=10.0,
+                 failure_threshold=5, reset_timeout=30.0):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def delay(self, attempt):
+        """attempt 번째 재시도 전에 기다릴 시간 (full jitter)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def replace(self, **kwargs):
+        params = dict(vars(self), **kwargs)
+        return RetryPolicy(**params)
+
+
+class CircuitBreaker:
+    """연속으로 실패한 endpoint 는 reset_timeout 동안 요청을 차단한다
+
+    reset_timeout 이 지나면 한 번의 시험 요청을 허용하고(half-open), 성공하면
+    다시 닫히고 실패하면 다시 열린다.
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened is None:
+            return "closed"
+        if time.monotonic() - self._opened >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def check(self, url=""):
+        """요청을 보내도 되는지 확인 - 차단된 경우 CircuitOpenError 발생"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpenError("circuit open: {}".format(url))
+
+    def record(self, ok):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened = None
+                return
+            self._failures += 1
+            if self._opened is not None or self._failures >= self.failure_threshold:
+                self._opened = time.monotonic()
+
+
+@singleton
+class RequestPolicy:
+    """endpoint(url) 별 RetryPolicy 와 CircuitBreaker 모음
+
+    정책은 url, 호스트, 기본값 순서로 찾는다.
+    """
+    def __init__(self):
+        self.default = RetryPolicy()
+        self._policies = {
+            # 파일 다운로드는 생성에 시간이 걸린다
+            "file.krx.co.kr"        : RetryPolicy(timeout=(3.05, 60)),
+            "fchart.stock.naver.com": RetryPolicy(timeout=(3.05, 10)),
+        }
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def configure(self, target=None, **kwargs):
+        """정책 변경
+        :param target: url 또는 호스트 - 입력하지 않으면 기본 정책을 변경
+        :param kwargs: RetryPolicy 파라미터
+        """
+        with self._lock:
+            if target is None:
+                self.default = self.default.replace(**kwargs)
+                self._policies = {k: v.replace(**kwargs) for k, v in self._policies.items()}
+            else:
+                self._policies[target] = self._policies.get(target, self.default).replace(**kwargs)
+            self._breakers.clear()
+
+    def get(self, url):
+        endpoint = url.split("?")[0]
+        policy = self._policies.get(endpoint)
+        if policy is None:
+            policy = self._policies.get(urlsplit(url).hostname, self.default)
+        return policy
+
+    def breaker(self, url):
+        endpoint = url.split("?")[0]
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                policy = self.get(url)
+                breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+                self._breakers[endpoint] = breaker
+            return breaker
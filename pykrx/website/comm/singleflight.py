@@ -0,0 +1,46 @@
+import threading
+from pykrx.website.comm.util import singleton
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+@singleton
+class SingleFlight:
+    """같은 키의 요청이 동시에 들어오면 한 번만 실행하고 결과를 나눠준다
+
+    먼저 들어온 요청이 func 를 실행하는 동안 같은 키로 들어온 요청은 기다렸다가
+    같은 결과(또는 예외)를 돌려받는다.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -1,5 +1,20 @@
+import os
+import json
+import datetime
+import threading
+import functools
+import contextlib
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pandas import DataFrame
 
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
 
 def dataframe_empty_handler(func):
     def wrapper(*args, **kwargs):
@@ -10,6 +25,55 @@ def dataframe_empty_handler(func):
     return wrapper
 
 
+def split_date_range(fromdate, todate, freq="Y"):
+    """조회 기간을 연(Y) 또는 분기(Q) 단위로 나눈다
+    :param fromdate: 조회 시작 일자 (YYYYMMDD)
+    :param todate  : 조회 종료 일자 (YYYYMMDD)
+    :param freq    : Y - 연 / Q - 분기
+    :return        : (시작 일자, 종료 일자) 리스트
+        [('20181101', '20181231'), ('20190101', '20190331'), ('20190401', '20190415')]
+    """
+    months = 12 if freq.upper() == "Y" else 3
+    strt = datetime.datetime.strptime(fromdate, "%Y%m%d").date()
+    last = datetime.datetime.strptime(todate, "%Y%m%d").date()
+    ranges = []
+    while strt <= last:
+        # 다음 구간의 첫 날 (연/분기의 시작)
+        month = (strt.month - 1) // months * months + months
+        head = datetime.date(strt.year + month // 12, month % 12 + 1, 1)
+        tail = min(last, head - datetime.timedelta(days=1))
+        ranges.append((strt.strftime("%Y%m%d"), tail.strftime("%Y%m%d")))
+        strt = head
+    return ranges
+
+
+def chunked(freq="Y", max_workers=4):
+    """조회 기간이 긴 요청을 freq 단위로 나눠서 동시에 조회한 뒤 날짜 순으로 합친다
+
+    구간마다 별도의 요청을 보내므로 응답 캐시에도 구간 단위로 저장된다. 일부 구간이
+    실패하면 다시 조회할 때 그 구간만 네트워크에서 가져온다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(fromdate, todate, *args, **kwargs):
+            ranges = split_date_range(fromdate, todate, freq)
+            if len(ranges) <= 1:
+                return func(fromdate, todate, *args, **kwargs)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(func, a, b, *args, **kwargs) for a, b in ranges]
+                frames = [future.result() for future in futures]
+
+            frames = [df for df in frames if not df.empty]
+            if len(frames) == 0:
+                return DataFrame()
+            df = pd.concat(frames)
+            df = df[~df.index.duplicated(keep='last')]
+            return df.sort_index()
+        return wrapper
+    return decorator
+
+
 def singleton(class_):
     class class_w(class_):
         _instance = None
@@ -25,3 +89,72 @@ def singleton(class_):
             self._sealed = True
     class_w.__name__ = class_.__name__
     return class_w
+
+
+def get_cache_dir():
+    """pykrx가 데이터를 저장하는 디렉터리 - PYKRX_CACHE_DIR 환경 변수로 변경"""
+    path = os.environ.get("PYKRX_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "pykrx")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_file(path, default, *names, create=True):
+    """저장 파일의 경로
+    :param path   : 사용자가 지정한 저장 디렉터리 - None 이면 PYKRX_CACHE_DIR/<default>
+    :param default: 기본 저장 디렉터리 이름 - None 이면 PYKRX_CACHE_DIR
+    :param names  : 하위 디렉터리와 파일 이름
+    :param create : 상위 디렉터리를 만들지 여부
+    """
+    root = path or (get_cache_dir() if default is None else os.path.join(get_cache_dir(), default))
+    path = os.path.join(root, *names)
+    if create:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def write_file(path, writer):
+    """임시 파일에 기록한 뒤 교체해서 읽는 쪽이 쓰다 만 파일을 보지 않도록 한다
+    :param path  : 저장할 파일 경로
+    :param writer: writer(임시 파일 경로) - 임시 파일에 내용을 기록
+    """
+    tmp = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+    try:
+        writer(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """여러 프로세스가 path 를 읽고 고쳐 쓰는 동안 <path>.lock 파일을 잠근다
+    :param path: 잠글 파일 경로
+    """
+    with open(path + ".lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK 은 10초 동안 재시도한 뒤 OSError 를 발생시킨다
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json(path, data, **kwargs):
+    def writer(tmp):
+        with open(tmp, "w") as f:
+            json.dump(data, f, **kwargs)
+    write_file(path, writer)
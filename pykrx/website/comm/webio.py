@@ -1,10 +1,151 @@
+import time
+import asyncio
+import functools
+import threading
 import requests
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from pykrx.website.comm.util import singleton
+from pykrx.website.comm.ratelimit import RateLimiter
+from pykrx.website.comm.retry import RequestPolicy
+
+
+@singleton
+class SessionPool:
+    """호스트별 keep-alive 세션 풀
+
+    Get/Post 는 호스트마다 하나의 requests.Session 을 공유하여 TCP 연결을
+    재사용한다. 세션은 처음 사용될 때 생성되며 스레드 간에 공유된다.
+
+        pool = SessionPool()
+        pool.set_pool_size("marketdata.krx.co.kr", 32)
+        with pool:
+            ...                 # 블록을 벗어나면 모든 연결을 닫는다
+    """
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self._pool_sizes = {}
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def set_pool_size(self, host, size):
+        """호스트의 최대 동시 연결 수를 지정
+        :param host: 호스트 이름 (예: marketdata.krx.co.kr)
+        :param size: 연결 풀의 크기
+        """
+        with self._lock:
+            self._pool_sizes[host] = size
+            # 다음 요청부터 새 크기의 풀을 사용하도록 기존 세션을 닫는다
+            session = self._sessions.pop(host, None)
+        if session is not None:
+            session.close()
+
+    def get(self, url):
+        """url 의 호스트에 해당하는 세션을 반환"""
+        host = urlsplit(url).hostname
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create(self._pool_sizes.get(host, self.pool_size))
+                self._sessions[host] = session
+            return session
+
+    def close(self):
+        """열려있는 모든 세션과 연결을 닫는다"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _create(size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=True)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+@singleton
+class ThreadedExecutor:
+    """asyncio 에서 블로킹 함수를 실행하는 스레드 풀
+
+    비동기 transport 가 아니다 - requests 는 블로킹 I/O 이므로 코루틴은 pykrx.stock
+    함수 전체를 이 풀의 스레드에서 실행하고 이벤트 루프는 결과만 기다린다. 동시에
+    진행되는 조회 수는 max_workers 개의 스레드로 제한된다.
+    """
+    def __init__(self, max_workers=16):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def set_max_workers(self, max_workers):
+        """동시에 진행할 수 있는 요청 수를 지정"""
+        executor, self._executor = self._executor, ThreadPoolExecutor(max_workers=max_workers)
+        executor.shutdown(wait=False)
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+
+def _send(session, method, url, **kwargs):
+    limiter = RateLimiter().get(url)
+    limiter.acquire()
+    start, ok = time.monotonic(), False
+    try:
+        resp = session.request(method, url, **kwargs)
+        ok = not _is_transient(resp)
+        return resp
+    finally:
+        limiter.release(time.monotonic() - start, ok)
+
+
+# 연결이 끊기거나 응답이 중간에 잘린 경우는 다시 요청하면 성공할 수 있다
+_RETRYABLE = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+def _is_transient(resp):
+    # 429 Too Many Requests / 5xx 는 과부하 신호로 간주
+    return resp.status_code == 429 or resp.status_code >= 500
+
+
+def _request(method, url, **kwargs):
+    """호스트의 속도 제한과 endpoint 의 재시도 정책을 지키면서 풀링된 세션으로
+    요청을 보낸다"""
+    session = SessionPool().get(url)
+    policy = RequestPolicy().get(url)
+    breaker = RequestPolicy().breaker(url)
+    for attempt in range(policy.retries + 1):
+        breaker.check(url)
+        try:
+            resp = _send(session, method, url, timeout=policy.timeout, **kwargs)
+        except _RETRYABLE:
+            breaker.record(False)
+            if attempt == policy.retries:
+                raise
+        except Exception:
+            # 결과를 기록하지 않으면 half-open 의 시험 요청이 끝나지 않아 계속 차단된다
+            breaker.record(False)
+            raise
+        else:
+            transient = _is_transient(resp)
+            breaker.record(not transient)
+            if not transient or attempt == policy.retries:
+                return resp
+        time.sleep(policy.delay(attempt))
 
 
 class Get:
     def read(self, **params):
-        resp = requests.get(self.url, headers=self.headers, params=params)
+        resp = _request("GET", self.url, headers=self.headers, params=params)
         return resp
 
     @property
@@ -19,7 +160,7 @@ class Get:
 
 class Post:
     def read(self, **params):
-        resp = requests.post(self.url, headers=self.headers, data=params)
+        resp = _request("POST", self.url, headers=self.headers, data=params)
         return resp
 
     @property
@@ -31,5 +172,3 @@ class Post:
     @abstractmethod
     def url(self):
         return NotImplementedError
-
-
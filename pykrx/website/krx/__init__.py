@@ -1,3 +1,4 @@
 from .market import *
 from .e3.etf import *
-from .bond import *
\ No newline at end of file
+from .bond import *
+from .calendar import *
@@ -0,0 +1,194 @@
+from pykrx.website.comm import singleton
+from pykrx.website.comm.util import cache_file, write_json, split_date_range
+from pykrx.website.krx.market.wrap import get_index_ohlcv_by_date
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import threading
+import datetime
+import bisect
+import json
+import time
+import os
+
+
+class CalendarError(IOError):
+    """거래일 달력이 조회 구간을 모두 포함하지 못할 때 발생"""
+    pass
+
+
+def _to_text(date):
+    return date.strftime("%Y%m%d")
+
+
+def _shift(date, days):
+    date = datetime.datetime.strptime(date, "%Y%m%d") + datetime.timedelta(days=days)
+    return _to_text(date)
+
+
+@singleton
+class TradingCalendar:
+    """KRX 거래일 달력
+
+    코스피 지수(1001)의 일자별 시세가 있는 날을 거래일로 본다. 전체 이력을 한 번
+    받아서 <cache>/calendar.json 에 저장하고, 이후에는 저장된 마지막 날짜 이후만
+    받아서 이어 붙인다. 오늘은 장이 열린 뒤에 지수 시세가 생기므로 저장하지 않고
+    ttl 초 동안만 기억한다. 오늘 이후의 날짜는 휴장일을 알 수 없으므로 평일을
+    거래일로 추정한다. 달력이 조회 구간을 모두 포함하지 못하면(조회 실패)
+    CalendarError 가 발생한다.
+    """
+    # 달력을 만드는 지수 이력의 시작 일자 - 이후 구간의 빈 응답은 조회 실패로 본다
+    start = "19900101"
+    # 오늘이 거래일인지 다시 확인하기까지의 시간 (초)
+    ttl = 600
+    # 이력의 끝에서 휴장일로 볼 수 있는 연속된 평일 수 (추석/설 연휴)
+    holiday_run = 5
+
+    def __init__(self, path=None):
+        self.path = path
+        self._days = None
+        self._end = None
+        # 이력의 끝에 있는 휴장일 구간 - 이후 거래일이 확인되기 전까지 ttl 동안만 사용
+        self._tail = None
+        self._today = None
+        self._lock = threading.RLock()
+
+    def configure(self, path=None):
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._days = None
+                self._tail = None
+
+    def is_trading_day(self, date):
+        days = self._calendar(date)
+        i = bisect.bisect_left(days, date)
+        return i < len(days) and days[i] == date
+
+    def prev_trading_day(self, date):
+        """date 이전의 가장 가까운 거래일 - 없으면 None"""
+        days = self._calendar(date)
+        i = bisect.bisect_left(days, date)
+        return days[i - 1] if i > 0 else None
+
+    def next_trading_day(self, date):
+        """date 이후의 가장 가까운 거래일"""
+        # 연휴를 고려해도 2주 안에는 거래일이 있다
+        days = self._calendar(_shift(date, 14))
+        i = bisect.bisect_right(days, date)
+        return days[i] if i < len(days) else None
+
+    def trading_days(self, fromdate, todate):
+        """[fromdate, todate] 구간의 거래일 리스트 (YYYYMMDD)"""
+        days = self._calendar(todate)
+        return days[bisect.bisect_left(days, fromdate):bisect.bisect_right(days, todate)]
+
+    def nearest_business_day(self, date=None):
+        """date(기본값 오늘)와 같거나 이전의 가장 가까운 거래일"""
+        if date is None:
+            date = _to_text(datetime.date.today())
+        days = self._calendar(date)
+        i = bisect.bisect_right(days, date)
+        return days[i - 1] if i > 0 else None
+
+    def _calendar(self, todate):
+        """todate 까지의 거래일 리스트"""
+        today = _to_text(datetime.date.today())
+        with self._lock:
+            end = min(todate, _shift(today, -1))
+            self._extend(end)
+            if self.start <= end and end > self._covered():
+                raise CalendarError("trading calendar is available until {}, not {}".format(
+                    self._covered(), end))
+            if todate < today:
+                return self._days
+            days = self._days + ([today] if self._is_open(today) else [])
+        if todate > today:
+            future = pd.bdate_range(_shift(today, 1), todate)
+            days = days + [_to_text(d) for d in future]
+        return days
+
+    def _covered(self):
+        """달력이 포함하는 마지막 날짜"""
+        end = self._end or ""
+        if self._tail is not None and time.time() - self._tail[1] <= self.ttl:
+            end = max(end, self._tail[0])
+        return end
+
+    def _extend(self, end):
+        if self._days is None:
+            self._load()
+        if end <= self._covered() or end < self.start:
+            return
+        fromdate = self.start if self._end is None else _shift(self._end, 1)
+        ranges = split_date_range(fromdate, end, "Y")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(get_index_ohlcv_by_date, a, b, "1001") for a, b in ranges]
+
+        covered, error = None, None
+        for i, ((a, b), future) in enumerate(zip(ranges, futures)):
+            try:
+                df = future.result()
+            except Exception as e:
+                error = e
+                break
+            if df.empty:
+                weekdays = len(pd.bdate_range(a, b))
+                if weekdays == 0:
+                    covered = b
+                    continue
+                if i == len(ranges) - 1 and weekdays <= self.holiday_run:
+                    # 최근 연휴일 수 있지만 조회 오류와 구분할 수 없으므로 저장하지 않는다
+                    self._tail = (b, time.time())
+                # 조회 오류와 휴장일만 있는 구간을 구분할 수 없으므로 여기까지만 기록한다
+                break
+            self._days.extend(_to_text(x) for x in df.index)
+            covered = b
+        if covered is not None:
+            self._end = covered
+            self._save()
+        if error is not None:
+            raise CalendarError("failed to fetch the trading calendar") from error
+
+    def _is_open(self, today):
+        if self._today is None or self._today[0] != today or \
+                time.time() - self._today[1] > self.ttl:
+            try:
+                df = get_index_ohlcv_by_date(today, today, "1001")
+            except Exception as e:
+                raise CalendarError("failed to check today's market") from e
+            self._today = (today, time.time(), not df.empty)
+        return self._today[2]
+
+    def _load(self):
+        self._days, self._end = [], None
+        path = self._file()
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            self._days, self._end = data["days"], data["end"]
+
+    def _save(self):
+        write_json(self._file(), {"end": self._end, "days": self._days})
+
+    def _file(self):
+        return cache_file(self.path, None, "calendar.json")
+
+
+def is_trading_day(date):
+    return TradingCalendar().is_trading_day(date)
+
+
+def prev_trading_day(date):
+    return TradingCalendar().prev_trading_day(date)
+
+
+def next_trading_day(date):
+    return TradingCalendar().next_trading_day(date)
+
+
+def trading_days(fromdate, todate):
+    return TradingCalendar().trading_days(fromdate, todate)
+
+
+def nearest_business_day(date=None):
+    return TradingCalendar().nearest_business_day(date)
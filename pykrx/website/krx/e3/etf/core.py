@@ -1,4 +1,5 @@
 from pykrx.website.krx.krxio import KrxWebIo
+from pykrx.website.comm.parse import records_to_frame
 from pandas import DataFrame
 
 
@@ -55,11 +56,12 @@ class MKD60007(KrxWebIo):
     def bld(self):
         return "MKD/08/0801/08010700/mkd08010700_04"
 
-    def fetch(self, fromdate, todate, isin):
+    def fetch(self, fromdate, todate, isin, columns=None):
         """ 종목의 NAV와 OHLCV
         :param fromdate: 조회 시작 일자 (YYYYMMDD)
         :param todate: 조회 종료 일자 (YYYYMMDD)
         :param isin: 조회할 종목의 ISIN 번호
+        :param columns: {키: dtype} - 입력하면 해당 키만 dtype 으로 변환해서 반환
         :return:
 
            fluc_tp_cd isu_end_pr isu_hg_pr isu_lw_pr isu_opn_pr last_indx last_nav   prv_dd_cmpr tot_tr_amt tot_tr_vl  work_dt
@@ -69,7 +71,7 @@ class MKD60007(KrxWebIo):
                1        28,405     28,495    28,380     28,480    277.60  28,465.95       5        4,118     144,815  2019/03/26
         """
         result = self.post(fromdate=fromdate, todate=todate, isu_cd=isin)
-        return DataFrame(result['block1'])
+        return records_to_frame(result['block1'], columns)
 
 
 class MKD60015(KrxWebIo):
@@ -1,13 +1,47 @@
 from pykrx.website.comm import dataframe_empty_handler, singleton
-from pykrx.website.krx.e3.etf.core import (MKD60003, MKD60007)
-import datetime
+from pykrx.website.comm.util import cache_file, write_json
+from pykrx.website.krx.e3.etf.core import MKD60003
+from pykrx.website.krx.calendar import nearest_business_day
+from collections import OrderedDict
+import threading
+import json
+import os
+
+
+class _EtfSymbol:
+    """ETF 하나의 정보 - 조회한 목록에서 상장이 확인된 첫 날짜와 마지막 날짜를 함께 보관"""
+    __slots__ = ('isin', 'name', 'first', 'last')
+
+    def __init__(self, isin, name, first, last):
+        self.isin = isin
+        self.name = name
+        self.first = first
+        self.last = last
 
 
 @singleton
 class EtfTicker:
-    def __init__(self):
-        self.df = None        
-        self.prev_date = None
+    """ETF 목록
+
+    날짜별 ETF 목록은 최근에 사용한 maxsize 개의 날짜만 메모리에 보관한다. 조회한
+    목록은 모두 {티커: ISIN/종목명/상장 확인 구간} master 에 합쳐서
+    <cache>/ticker/etf.json 에 저장하므로 ISIN/종목명 조회는 dict 에서 처리되고
+    master 에 없는 티커일 때만 최근 영업일의 목록을 받는다.
+    """
+    def __init__(self, path=None, maxsize=32):
+        self.path = path
+        self.maxsize = maxsize
+        self._listings = OrderedDict()
+        self._master = None
+        self._lock = threading.RLock()
+
+    def configure(self, path=None, maxsize=None):
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._master = None
+            if maxsize is not None:
+                self.maxsize = maxsize
 
     @dataframe_empty_handler
     def _get_tickers(self, date):
@@ -18,39 +52,80 @@ class EtfTicker:
         df.columns = ['isin', 'name']
         return df
 
-    @dataframe_empty_handler
     def get_ticker(self, date):
         """
         ETF의 티커를 조회
         :arg date 문자열 형태의 날짜정보
         :return ticker의 리스트를 반환
         """
-        if self.df is None or self.prev_date != date:
-            self.__update_db(date)
-        return self.df.index.to_list()
-
-    @dataframe_empty_handler
-    def __update_db(self, date=None):
-        if date is None:
-            date = EtfTicker._get_closest_business_day()
-        self.df = self._get_tickers(date)
+        return list(self._listing(date))
 
     def get_name(self, ticker):
-        if self.df is None:
-            self.__update_db()
-        return self.df.loc[ticker, 'name']
+        return self._symbol(ticker).name
 
     def get_isin(self, ticker):
-        if self.df is None:
-            self.__update_db()
-        return self.df.loc[ticker, 'isin']
+        return self._symbol(ticker).isin
+
+    def get_interval(self, ticker):
+        """조회한 목록에서 상장이 확인된 (첫 날짜, 마지막 날짜)"""
+        symbol = self._symbol(ticker)
+        return symbol.first, symbol.last
+
+    def _listing(self, date):
+        with self._lock:
+            listing = self._listings.get(date)
+            if listing is not None:
+                self._listings.move_to_end(date)
+                return listing
+
+            df = self._get_tickers(date)
+            if df.empty:
+                # 조회에 실패한 결과는 보관하지 않고 다음 요청에서 다시 받는다
+                return []
+            listing = list(df.index)
+            self._listings[date] = listing
+            if len(self._listings) > self.maxsize:
+                self._listings.popitem(last=False)
+            self._merge(date, df)
+            return listing
+
+    def _symbol(self, ticker):
+        with self._lock:
+            master = self._load_master()
+            if ticker not in master:
+                self._listing(self._get_closest_business_day())
+            return master[ticker]
+
+    def _merge(self, date, df):
+        master = self._load_master()
+        for ticker, isin, name in zip(df.index, df['isin'], df['name']):
+            symbol = master.get(ticker)
+            if symbol is None:
+                master[ticker] = _EtfSymbol(isin, name, date, date)
+                continue
+            if date >= symbol.last:
+                symbol.isin, symbol.name, symbol.last = isin, name, date
+            symbol.first = min(symbol.first, date)
+
+        write_json(self._file(), {ticker: [s.isin, s.name, s.first, s.last]
+                                  for ticker, s in master.items()}, ensure_ascii=False)
+
+    def _load_master(self):
+        if self._master is None:
+            master = {}
+            path = self._file()
+            if os.path.exists(path):
+                with open(path) as f:
+                    master = {ticker: _EtfSymbol(*values) for ticker, values in json.load(f).items()}
+            self._master = master
+        return self._master
+
+    def _file(self):
+        return cache_file(self.path, "ticker", "etf.json")
 
     @staticmethod
     def _get_closest_business_day():
-        now = datetime.datetime.now()
-        past = now - datetime.timedelta(days=14)
-        df = MKD60007().fetch(past.strftime("%Y%m%d"), now.strftime("%Y%m%d"), "KR7069500007")
-        return df['work_dt'].iloc[0].replace("/", "")
+        return nearest_business_day()
 
 
 @dataframe_empty_handler
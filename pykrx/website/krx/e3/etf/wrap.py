@@ -1,9 +1,8 @@
 from pykrx.website.comm import dataframe_empty_handler
+from pykrx.website.comm.parse import parse_frame, parse_date
 from pykrx.website.krx.e3.etf.core import (MKD60007, MKD60015, MKD80118, MKD80117)
 from pykrx.website.krx.e3.etf.ticker import EtfTicker
 import numpy as np
-import decimal
-import pandas as pd
 
 
 @dataframe_empty_handler
@@ -20,19 +19,15 @@ def get_etf_ohlcv_by_date(fromdate, todate, ticker):
         20180205     99400   99600   97200   97700   745562
     """
     isin = EtfTicker().get_isin(ticker)
-    df = MKD60007().fetch(fromdate, todate, isin)
-    df = df[['work_dt', 'last_nav', 'isu_opn_pr', 'isu_hg_pr', 'isu_lw_pr',
-             'isu_end_pr', 'tot_tr_vl', 'tot_tr_amt', 'last_indx']]
+    df = MKD60007().fetch(fromdate, todate, isin, columns={
+        'work_dt': str, 'last_nav': np.float64, 'isu_opn_pr': np.int32, 'isu_hg_pr': np.int32,
+        'isu_lw_pr': np.int32, 'isu_end_pr': np.int32, 'tot_tr_vl': np.int64,
+        'tot_tr_amt': np.int64, 'last_indx': np.float64})
     df.columns = ['날짜', 'NAV', '시가', '고가', '저가', '종가', '거래량',
                   '거래대금', '기초지수']
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('날짜')
-    df = df.astype({"NAV": np.float, "시가": np.int32, "고가": np.int32,
-                    "저가": np.int32, "종가": np.int32, "거래량": np.int64,
-                    "거래대금": np.int64, "기초지수": np.float})
     df['거래대금'] = df['거래대금'] * 1000000
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -57,14 +52,8 @@ def get_etf_portfolio_deposit_file(ticker, date):
     df = df[['isu_kor_nm', 'cu1_shrs', 'compst_amt', 'compst_amt_rt']]
     df.columns = ['종목', '계약수', '금액', '비중']
     df = df.set_index('종목')
-    df = df.replace(',', '', regex=True)
-    df = df.replace('-', '0', regex=True)
-    # - empty string은 int, float로 형변환 불가
-    #   -> 이 문제를 해결하기 위해 공백 문자는 0으로 치환
-    # - 7.00 과 같은 문자열은 int, float로 형변환 불가
-    #   -> 이 문제를 해결하기 위해 Decimal 클래스를 활용
-    df = df.applymap(lambda x: 0 if x == "" else decimal.Decimal(x))
-    df = df.astype({"계약수": np.int32, "금액": np.int64, "비중": np.float32 })
+    # 빈 문자열과 '-'는 0, 7.00 과 같은 실수 문자열은 정수로 변환된다
+    df = parse_frame(df, {"계약수": np.int64, "금액": np.int64, "비중": np.float32})
     return df
 
 
@@ -91,10 +80,8 @@ def get_etf_price_deviation(fromdate, todate, ticker):
     df = df[['work_dt', 'isu_end_pr', 'last_nav', 'diff_rt_9']]
     df.columns = ['날짜', '종가', 'NAV', '괴리율']
     df = df.set_index('날짜')
-    df = df.replace(',', '', regex=True)
-
-    df = df.astype({"종가": np.int32, "NAV": np.float32, "괴리율": np.float32})
-    df.index = pd.to_datetime(df.index, format='%Y/%m/%d')
+    df = parse_frame(df, {"종가": np.int32, "NAV": np.float32, "괴리율": np.float32})
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -121,9 +108,8 @@ def get_etf_tracking_error(fromdate, todate, ticker):
     df = df[['work_dt', 'mktd_nav', 'trc_tgt_indx', 'trc_err_rt']]
     df.columns = ['날짜', 'NAV', '지수', '추적오차']
     df = df.set_index('날짜')
-    df = df.replace(',', '', regex=True)
-    df = df.astype({"NAV": np.float32, "지수": np.float32, "추적오차": np.float32})
-    df.index = pd.to_datetime(df.index, format='%Y/%m/%d')
+    df = parse_frame(df, {"NAV": np.float32, "지수": np.float32, "추적오차": np.float32})
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -1,7 +1,22 @@
 import io
+import json
+import pandas as pd
+import time
+import threading
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pykrx.website.comm import singleton, RateLimiter
+from pykrx.website.comm.cache import ResponseCache
+from pykrx.website.comm.singleflight import SingleFlight
 from pykrx.website.comm.webio import Get, Post
 
+try:
+    # orjson 이 설치되어 있으면 bytes 를 바로 디코딩한다
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 class MarketOtp(Get):
     @property
@@ -9,12 +24,144 @@ class MarketOtp(Get):
         return "http://marketdata.krx.co.kr/contents/COM/GenerateOTP.jspx"
 
 
+@singleton
+class OtpManager:
+    """OTP 토큰 캐시
+
+    OTP 는 발급 조건(OTP url 과 파라미터) 별로 저장되어 서버가 거절하기 전까지
+    재사용된다. 조회 조건마다 발급 조건이 달라지는 파일 다운로드 OTP 는 재사용되지
+    않으므로 저장하지 않고 issue 로 매번 발급한다. 발급 후 refresh 초가 지난 토큰은 그대로 사용하면서 다음 토큰을
+    백그라운드에서 미리 발급받는다.
+    """
+    def __init__(self, refresh=300):
+        self.refresh = refresh
+        self._tokens = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=4)
+
+    def get(self, otp, **params):
+        """캐시된 OTP 를 반환 - 없으면 발급이 끝날 때까지 기다린다
+        :param otp   : OTP 발급 객체 (MarketOtp/ShortOtp)
+        :param params: OTP 발급 파라미터
+        :return      : OTP 문자열
+        """
+        key = self._key(otp, params)
+        with self._lock:
+            token = self._tokens.get(key)
+        if token is None:
+            return self.prefetch(otp, **params).result()
+
+        code, issued = token
+        if time.time() - issued > self.refresh:
+            self.prefetch(otp, **params)
+        return code
+
+    def prefetch(self, otp, **params):
+        """다음 요청에 사용할 OTP 를 백그라운드에서 발급
+        :return: 발급 결과를 담은 Future
+        """
+        key = self._key(otp, params)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._issue, key, otp, params)
+                self._pending[key] = future
+        return future
+
+    @staticmethod
+    def issue(otp, **params):
+        """저장하지 않는 일회용 OTP 발급"""
+        return otp.read(**params).text
+
+    def invalidate(self, otp, **params):
+        """서버가 거절한 OTP 를 캐시에서 제거"""
+        with self._lock:
+            self._tokens.pop(self._key(otp, params), None)
+
+    def _issue(self, key, otp, params):
+        try:
+            code = otp.read(**params).text
+            with self._lock:
+                self._tokens[key] = (code, time.time())
+            return code
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    @staticmethod
+    def _key(otp, params):
+        return otp.url, repr(sorted(params.items()))
+
+
+def _utf8(resp):
+    if resp.encoding is None or resp.encoding.lower() in ("utf-8", "utf8"):
+        return resp.content
+    return resp.text.encode("utf-8")
+
+
+def _is_file(content):
+    # 만료된 OTP 나 과부하 상태의 서버는 빈 응답이나 오류 페이지를 반환한다
+    return bool(content) and content.lstrip()[:1] != b"<"
+
+
+def _has_records(result):
+    # 과부하 상태의 서버는 block1/output/result 가 빈 리스트인 응답을 반환한다
+    if isinstance(result, list):
+        return len(result) > 0
+    records = [v for v in result.values() if isinstance(v, list)] if isinstance(result, dict) else []
+    return len(records) == 0 or any(len(v) > 0 for v in records)
+
+
+def read_table(buf, dtype=None):
+    """KrxFileIo 로 받은 파일을 DataFrame 으로 변환
+    CSV 는 C 파서로 모든 값을 문자열로 읽고 xls 는 read_excel 로 읽는다
+    :param buf  : KrxFileIo.post 의 반환 값
+    :param dtype: xls 를 읽을 때 사용할 dtype
+    :return     : DataFrame
+    """
+    head = buf.getvalue()[:4]
+    if head in (b"\xd0\xcf\x11\xe0", b"PK\x03\x04"):
+        return pd.read_excel(buf, dtype=dtype)
+    return pd.read_csv(buf, encoding="cp949", dtype=str)
+
+
+def _settle_days(bld):
+    # 공매도 정보는 T+2일에 확정된다
+    return 3 if bld.startswith("SRT") else 0
+
+
 class KrxWebIo(Post):
     def post(self, **params):
-        otp = MarketOtp().read(name="form", bld=self.bld)
-        params.update({"code": otp.text})
-        resp = super().read(**params)
-        return resp.json()
+        key = ResponseCache.key(self.url, self.bld, params)
+        # 같은 요청이 동시에 들어오면 하나의 응답을 함께 사용한다
+        return SingleFlight().do(key, self._post, key, params)
+
+    def _post(self, key, params):
+        cache = ResponseCache()
+        content = cache.get(key)
+        if content is not None:
+            return _loads(content)
+
+        otp_params = {"name": "form", "bld": self.bld}
+        for retry in (True, False):
+            code = OtpManager().get(MarketOtp(), **otp_params)
+            resp = super().read(code=code, **params)
+            content = _utf8(resp)
+            try:
+                result = _loads(content)
+                break
+            except ValueError:
+                # 만료된 OTP 나 과부하 상태의 서버는 JSON 대신 오류 페이지를 반환한다
+                OtpManager().invalidate(MarketOtp(), **otp_params)
+                RateLimiter().get(self.url).decrease()
+                if not retry:
+                    raise
+
+        # 빈 결과는 휴장일인지 조회 오류인지 알 수 없으므로 저장하지 않는다
+        if _has_records(result):
+            cache.set(key, content, cache.expires(params, _settle_days(self.bld)))
+        return result
 
     @property
     def url(self):
@@ -36,10 +183,46 @@ class KrxWebIo(Post):
 
 
 class KrxFileIo(Post):
+    # xls 보다 파싱이 빠른 CSV 를 먼저 요청하고 지원하지 않는 화면은 xls 로 받는다
+    filetype = "csv"
+    _xls_only = set()
+
     def post(self, **params):
-        otp = MarketOtp().read(name="fileDown", filetype="xls", url=self.bld, **params)
-        resp = super().read(code=otp.text)
-        return io.BytesIO(resp.content)
+        for filetype in self._filetypes():
+            otp_params = self._otp_params(params, filetype)
+            key = ResponseCache.key(self.url, self.bld, otp_params)
+            # 같은 파일을 동시에 요청하면 한 번만 내려받고 각자 읽을 수 있는 버퍼를 받는다
+            content = SingleFlight().do(key, self._download, key, otp_params, params)
+            if _is_file(content):
+                break
+            if not content.strip():
+                # CSV 를 지원하지 않는 화면은 빈 응답을 반환한다 - 오류 페이지(<)는 과부하일 수 있다
+                KrxFileIo._xls_only.add(self.bld)
+        return io.BytesIO(content)
+
+    def _download(self, key, otp_params, params):
+        cache = ResponseCache()
+        content = cache.get(key)
+        if content is not None:
+            return content
+
+        for _ in range(2):
+            # 다운로드 OTP 는 조회 조건을 모두 포함하므로 다시 쓰이지 않는다
+            code = OtpManager.issue(MarketOtp(), **otp_params)
+            resp = super().read(code=code)
+            if _is_file(resp.content):
+                cache.set(key, resp.content, cache.expires(params, _settle_days(self.bld)))
+                break
+            RateLimiter().get(self.url).decrease()
+        return resp.content
+
+    def _filetypes(self):
+        if self.filetype == "xls" or self.bld in self._xls_only:
+            return ["xls"]
+        return [self.filetype, "xls"]
+
+    def _otp_params(self, params, filetype):
+        return dict(name="fileDown", filetype=filetype, url=self.bld, **params)
 
     @property
     def url(self):
@@ -69,13 +252,7 @@ class ShortOtp(Get):
         return "http://short.krx.co.kr/contents/COM/GenerateOTP.jspx"
 
 
-class SrtWebIo(Post):
-    def post(self, **params):
-        otp = MarketOtp().read(name="form", bld=self.bld)
-        params.update({"code": otp.text})
-        resp = super().read(**params)
-        return resp.json()
-
+class SrtWebIo(KrxWebIo):
     @property
     def url(self):
         return "http://short.krx.co.kr/contents/SRT/99/SRT99000001.jspx"
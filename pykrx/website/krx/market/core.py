@@ -1,4 +1,5 @@
-from pykrx.website.krx.krxio import KrxWebIo, KrxFileIo, SrtWebIo
+from pykrx.website.krx.krxio import KrxWebIo, KrxFileIo, SrtWebIo, read_table
+from pykrx.website.comm.parse import records_to_frame
 import pandas as pd
 from pandas import DataFrame
 
@@ -40,7 +41,7 @@ class MKD30030(KrxFileIo):
             4     054620    APS홀딩스    4,475      10    0.22       4,475      4,460     31,950     142,780,675    4,440    4,520    4,440    500  원(KRW)   20,394,221     91,264,138,975
         """
         result = self.post(indx_ind_cd=market, schdate=date, secugrp=market_detail, stock_gubun=stock_type)
-        return pd.read_excel(result, dtype=str)
+        return read_table(result, dtype=str)
 
 
 class MKD30040(KrxWebIo):
@@ -48,11 +49,12 @@ class MKD30040(KrxWebIo):
     def bld(self):
         return "MKD/04/0402/04020100/mkd04020100t3_02"
 
-    def fetch(self, fromdate, todate, isin):
+    def fetch(self, fromdate, todate, isin, columns=None):
         """30040 일자별 시세 조회 (수정종가 아님)
         :param fromdate: 조회 시작 일자
         :param todate: 조회 마지막 일자
         :param isin: 조회할 종목의 ISIN 번호
+        :param columns: {키: dtype} - 입력하면 해당 키만 dtype 으로 변환해서 반환
         :return: 일자별 시세 조회 결과 DataFrame
 
             acc_trdval     acc_trdvol  fluc_tp  list_shrs    mktcap     tdd_clsprc tdd_cmpr tdd_hgprc tdd_lwprc  tdd_opnprc  trd_dd
@@ -63,7 +65,7 @@ class MKD30040(KrxWebIo):
         4   98,290,649,100    975,164       2  163,647,814  16,528,429    101,000    2,500   103,500    99,900    103,000  2018/02/02
         """
         result = self.post(isu_cd=isin, fromdate=fromdate, todate=todate)
-        return DataFrame(result['block1'])
+        return records_to_frame(result['block1'], columns)
 
 
 class MKD30015(KrxFileIo):
@@ -84,7 +86,7 @@ class MKD30015(KrxFileIo):
         4   005380     현대차  	120,500   1,000   0.8     363,959     43,797,875,448   120,000   121,000   119,000     25,747,016,533,500       1.52       213,668,187        95,237,158      44.57
         """
         result = self.post(market_gubun=market, schdate=date)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 class MKD30009_0(KrxWebIo):
@@ -113,12 +115,13 @@ class MKD30009_1(KrxWebIo):
     def bld(self):
         return "MKD/13/1302/13020401/mkd13020401"
 
-    def fetch(self, fromdate, todate, market, isin):
+    def fetch(self, fromdate, todate, market, isin, columns=None):
         """30009 PER/PBR/배당수익률 (개별종목)
         :param market: 조회 시장 (STK/KSQ/ALL)
         :param fromdate: 조회 시작 일자 (YYMMDD)
         :param todate: 조회 종료 일자 (YYMMDD)
         :param isin: 조회할 종목의 ISIN 번호
+        :param columns: {키: dtype} - 입력하면 해당 키만 dtype 으로 변환해서 반환
         :return:
                   bps dvd_yld  end_pr iisu_code isu_cd     isu_nm                 isu_nm2   pbr   per prv_eps rn stk_dvd totCnt     work_dt
             0  28,126     1.9  44,650         -  005930   삼성전자   <em class ="up"></em>  1.59  7.45   5,997  1     850      6  2019/03/29
@@ -131,7 +134,7 @@ class MKD30009_1(KrxWebIo):
         result = self.post(market_gubun=market, fromdate=fromdate,
                            todate=todate, gubun=2, isu_cd=isin,
                            isu_srt_cd="A" + isin[3:9])
-        return DataFrame(result['result'])
+        return records_to_frame(result['result'], columns)
 
 
 class MKD01023(KrxWebIo):
@@ -188,7 +191,7 @@ class MKD81006(KrxFileIo):
             4     000070   삼양홀딩스     8,564,271      8,564,271         661,240         7.72
         """
         result = self.post(market_gubun=market, lmt_tp=position_limit, schdate=date)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 class MKD81004(KrxFileIo):
@@ -209,7 +212,7 @@ class MKD81004(KrxFileIo):
                4     000070    삼양홀딩스    64,400      0     0.0     64,400   65,600   63,700      21,257    1,371,218,100     551,539,052,400       0.03            8,564,271
         """
         result = self.post(market_gubun=market, schdate=date)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 class MKD30017(KrxFileIo):
@@ -250,7 +253,7 @@ class MKD30017(KrxFileIo):
         """
         result = self.post(stctype=market, var_invr_cd=investor, schdate=date,
                            etctype=market_detail)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 ################################################################################
@@ -276,7 +279,7 @@ class MKD20011_SUB(KrxWebIo):
     def bld(self):
         return "MKD/03/0304/03040101/mkd03040101T2_02"
 
-    def fetch(self, fromdate, todate, index, market):
+    def fetch(self, fromdate, todate, index, market, columns=None):
         """코스피 주가 지수
         :param index    : 종합지수 - 코스피          (001)
                           종합지수 - 코스피 벤치마크 (100)
@@ -289,6 +292,7 @@ class MKD20011_SUB(KrxWebIo):
         :param market   : 코스피 (1) / 코스닥 (2)
         :param fromdate : 조회 시작 일자 (YYMMDD)
         :param todate   : 조회 마지막 일자 (YYMMDD)
+        :param columns  : {키: dtype} - 입력하면 해당 키만 dtype 으로 변환해서 반환
         :return         : 코스피 주가지수 DataFrame
                acc_trdval acc_trdvol clsprc_idx cmpprevdd_idx div_yd fluc_rt fluc_tp_cd hgprc_idx lwprc_idx         mktcap opnprc_idx      trd_dd wt_per wt_stkprc_netasst_rto
             0   4,897,406    419,441   2,117.77          6.84   1.86   -0.32          2  2,129.37  2,108.91  1,397,318,462   2,126.03  2019/01/22   9.95                  0.90
@@ -299,7 +303,7 @@ class MKD20011_SUB(KrxWebIo):
         idx_cd = "1{}".format(index)
         result = self.post(idx_cd=idx_cd, ind_tp_cd=market, idx_ind_cd=index, bz_dd=todate,
                            chartType="line", chartStandard="srate", fromdate=fromdate, todate=todate)
-        return DataFrame(result['output'])
+        return records_to_frame(result['output'], columns)
 
 
 class MKD20011_PDF(KrxWebIo):
@@ -451,7 +455,7 @@ class SRT02020100(KrxFileIo):
         """
 
         result = self.post(mkt_tp_cd=market, isu_cd=isin, strt_dd=fromedata, end_dd=todate)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 class SRT02020300(KrxWebIo):
@@ -520,7 +524,7 @@ class SRT02030100(KrxFileIo):
         """
 
         result = self.post(mkt_tp_cd=market, strt_dd=fromdate, end_dd=todate, isu_cd=isin)
-        return pd.read_excel(result)
+        return read_table(result)
 
 
 class SRT02030400(KrxWebIo):
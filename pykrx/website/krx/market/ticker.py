@@ -1,8 +1,15 @@
 from pykrx.website.comm import dataframe_empty_handler, singleton
+from pykrx.website.comm.util import cache_file, write_file, write_json
 from pykrx.website.krx.krxio import KrxWebIo
 from pykrx.website.krx.market.core import MKD20011
 from pandas import DataFrame
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import threading
+import bisect
+import json
+import time
+import os
 
 
 class _StockFinder(KrxWebIo):
@@ -37,13 +44,92 @@ class _DelistingFinder(KrxWebIo):
         return DataFrame(result['result'])
 
 
+class _Symbol:
+    """종목 하나의 정보 - 종목 수만큼 만들어지므로 __slots__ 로 메모리를 줄인다"""
+    __slots__ = ('ticker', 'isin', 'name', 'market', 'delist')
+
+    def __init__(self, ticker, isin, name, market, delist=None):
+        self.ticker = ticker
+        self.isin = isin
+        self.name = name
+        self.market = market
+        self.delist = delist
+
+    def __repr__(self):
+        return "_Symbol({}, {}, {}, {})".format(self.ticker, self.isin, self.name, self.market)
+
+
 @singleton
 class _StockTicker:
-    def __init__(self):
-        # 조회일 기준의 상장/상폐 종목 리스트
-        self.listed = self._get_stock_info_listed()
-        self.delisted = self._get_stock_info_delisted()
+    """상장/상폐 종목 정보
+
+    상장 종목과 상폐 종목은 처음 필요할 때 따로 불러온다. 상장 종목에서 찾지 못한
+    경우에만 상폐 종목을 불러오며, 불러온 목록은 <cache>/ticker/<listed|delisted>
+    파일로 저장해서 ttl 초 동안 다른 프로세스도 다운로드 없이 사용한다.
+    조회는 목록마다 한 번 만드는 {티커: _Symbol} dict 에서 처리한다.
+    """
+    PARTS = ("listed", "delisted")
+
+    def __init__(self, path=None, ttl=24 * 60 * 60):
+        self.path = path
+        self.ttl = ttl
+        self._frames = {}
+        self._symbols = {}
+        self._lock = threading.RLock()
+
+    def configure(self, path=None, ttl=None):
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._frames = {}
+                self._symbols = {}
+            if ttl is not None:
+                self.ttl = ttl
+
+    @property
+    def listed(self):
+        # 조회일 기준의 상장 종목 리스트
+        return self._load("listed")
 
+    @property
+    def delisted(self):
+        # 조회일 기준의 상폐 종목 리스트
+        return self._load("delisted")
+
+    def refresh(self, part=None):
+        """저장된 종목 정보를 버리고 KRX에서 다시 받는다
+        :param part: listed / delisted - 입력하지 않으면 모두
+        """
+        parts = self.PARTS if part is None else [part]
+        with self._lock:
+            for name in parts:
+                self._frames.pop(name, None)
+                self._symbols.pop(name, None)
+                self._load(name, force=True)
+
+    def _load(self, part, force=False):
+        df = self._frames.get(part)
+        if df is not None and not force:
+            return df
+        with self._lock:
+            df = self._frames.get(part)
+            if df is not None and not force:
+                return df
+            path = self._file(part)
+            if not force and os.path.exists(path) and \
+                    time.time() - os.path.getmtime(path) <= self.ttl:
+                df = pd.read_pickle(path)
+            else:
+                df = getattr(self, "_get_stock_info_" + part)()
+                if df.empty:
+                    # 조회에 실패한 결과는 저장하지 않고 다음 요청에서 다시 받는다
+                    return df
+                write_file(path, df.to_pickle)
+            self._frames[part] = df
+            return df
+
+    def _file(self, part):
+        return cache_file(self.path, "ticker", "{}.pickle".format(part))
 
     @dataframe_empty_handler
     def _get_stock_info_listed(self, market="전체"):
@@ -89,44 +175,96 @@ class _StockTicker:
         df = df.drop_duplicates(['ISIN'])
         return df
 
-    def get_series(self, ticker):
-        """입력된 종목(ticker)의 정보를 Series로 반환
+    def get(self, ticker):
+        """입력된 종목(ticker)의 정보
         :param ticker: 6자리 종목 구분 정보
-        :return      : 종목정보가 저장된 Series
-            종목         삼성전자
-            ISIN    KR7005930003
-            시장           KOSPI
-            상폐일           NaN
+        :return      : _Symbol - 상장/상폐 종목에 모두 없으면 None
         """
-        df = self.listed
-        if ticker not in df.index:
-            df = self.delisted
-            if ticker not in df.index:
-                return None
-            # 030270 에스마크	KR7030270003
-            # 030270 가희 11R	KRA030270151
-            elif isinstance(df.loc[ticker], DataFrame):
-                # ISIN을 기준으로 sorting 후 첫 번째 데이터를 선택
-                df = df.loc[ticker].sort_values('ISIN').iloc[:1]
-        return df.loc[ticker]
+        symbol = self._index("listed").get(ticker)
+        if symbol is None:
+            symbol = self._index("delisted").get(ticker)
+        return symbol
+
+    def _index(self, part):
+        symbols = self._symbols.get(part)
+        if symbols is not None:
+            return symbols
+        with self._lock:
+            df = self._load(part)
+            if df.empty:
+                return {}
+            if part == "delisted":
+                # 030270 에스마크	KR7030270003
+                # 030270 가희 11R	KRA030270151
+                # 같은 티커가 여러 번 상폐된 경우 ISIN이 가장 작은 종목을 선택
+                df = df.sort_values('ISIN', kind='mergesort')
+                delist = df['상폐일'].tolist()
+            else:
+                delist = [None] * len(df)
+            symbols = {}
+            for ticker, isin, name, market, dd in zip(df.index, df['ISIN'], df['종목'], df['시장'], delist):
+                if ticker not in symbols:
+                    symbols[ticker] = _Symbol(ticker, isin, name, market, dd)
+            self._symbols[part] = symbols
+            return symbols
+
+    def resolve(self, tickers, field):
+        """여러 종목의 정보를 한 번에 조회
+        :param tickers: 티커 리스트
+        :param field  : isin / name / market / delist
+        :return       : 티커를 index로 갖는 Series - 없는 종목은 None
+        """
+        values = []
+        for ticker in tickers:
+            symbol = self.get(ticker)
+            values.append(None if symbol is None else getattr(symbol, field))
+        return pd.Series(values, index=pd.Index(list(tickers), name='티커'), dtype=object)
 
 
 @dataframe_empty_handler
 def get_stock_name(ticker):
-    s = _StockTicker().get_series(ticker)
-    return s['종목']
+    return _StockTicker().get(ticker).name
 
 
 @dataframe_empty_handler
 def get_stock_ticker_isin(ticker):
-    s = _StockTicker().get_series(ticker)
-    return s['ISIN']
+    return _StockTicker().get(ticker).isin
 
 
 @dataframe_empty_handler
 def get_stock_market_from(ticker):
-    s = _StockTicker().get_series(ticker)
-    return s['시장']
+    return _StockTicker().get(ticker).market
+
+
+def resolve_isins(tickers):
+    """티커 리스트의 ISIN을 Series로 반환 - 없는 종목은 None"""
+    return _StockTicker().resolve(tickers, "isin")
+
+
+def resolve_names(tickers):
+    """티커 리스트의 종목명을 Series로 반환 - 없는 종목은 None"""
+    return _StockTicker().resolve(tickers, "name")
+
+
+def resolve_delist_dates(tickers):
+    """티커 리스트의 상폐일을 Series로 반환 - 상장 종목과 없는 종목은 None"""
+    return _StockTicker().resolve(tickers, "delist")
+
+
+def set_stock_ticker_master(path=None, ttl=None):
+    """종목/지수 정보 저장 위치와 유효 시간(초) 설정"""
+    _StockTicker().configure(path, ttl)
+    IndexTicker().configure(path, ttl)
+
+
+def refresh_stock_ticker_master(part=None):
+    """종목/지수 정보를 KRX에서 다시 받는다
+    :param part: listed / delisted / index - 입력하지 않으면 모두
+    """
+    if part in (None, "listed", "delisted"):
+        _StockTicker().refresh(part)
+    if part in (None, "index"):
+        IndexTicker().refresh()
 
 
 ################################################################################
@@ -134,45 +272,102 @@ def get_stock_market_from(ticker):
 
 def fetch_index_df(method):
     def func_wrapper(self, *args, **kwargs):
-        if self.df.empty:
-            # 02 : KOSPI / 03 : KOSDAQ
-            for index in ["02", "03"]:
-                # date is not supported
-                df = MKD20011().fetch("", index)
-                if len(df) == 0:
-                    continue
-
-                df = df[['idx_nm', 'bas_idx', 'ind_tp_cd', 'bas_tm', 'idx_clss', 'idx_ind_cd']]
-                df.columns = ['지수명', '기준지수', '시장', '기준시점', '구분', '티커']
-                # 다른 지수에 같은 티커가 존재함. 중복 문제를 피하기 위해 코스피 1xxx 코스닥 2xxx로
-                # 내부에서 사용함
-                df['티커'] = df['시장'] + df['티커']
-                df['시장'] = df['시장'].apply(lambda x: "KOSPI" if x == "1" else "KOSDAQ")
-                df['기준시점'] = pd.to_datetime(df['기준시점'])
-                df = df.set_index('티커')
-                self.df = self.df.append(df)
-
+        if self._names is None:
+            self._build()
         return method(self, *args, **kwargs)
     return func_wrapper
 
 
+def _fetch_index_master(index):
+    # date is not supported
+    df = MKD20011().fetch("", index)
+    if len(df) == 0:
+        return []
+    # 다른 지수에 같은 티커가 존재함. 중복 문제를 피하기 위해 코스피 1xxx 코스닥 2xxx로
+    # 내부에서 사용함
+    dates = pd.to_datetime(df['bas_tm']).dt.strftime("%Y%m%d")
+    return [[market + ticker, name, "KOSPI" if market == "1" else "KOSDAQ", date]
+            for market, ticker, name, date in zip(df['ind_tp_cd'], df['idx_ind_cd'], df['idx_nm'], dates)]
+
+
 @singleton
 class IndexTicker:
-    def __init__(self):
-        self.df = DataFrame()
+    """지수 티커/지수명/시장/기준시점
+
+    시장별로 기준시점 순으로 정렬해 두고 조회일 이전에 만들어진 지수를 bisect로
+    찾는다. 받은 목록은 <cache>/ticker/index.json 에 저장해서 ttl 초 동안 사용한다.
+    """
+    def __init__(self, path=None, ttl=24 * 60 * 60):
+        self.path = path
+        self.ttl = ttl
+        self._names = None
+        # 목록을 받지 못했을 때도 빈 결과를 반환하도록 미리 만들어 둔다
+        self._markets = {}
+        self._dates = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def configure(self, path=None, ttl=None):
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                self._names = None
+            if ttl is not None:
+                self.ttl = ttl
+
+    def refresh(self):
+        self._build(force=True)
 
     @fetch_index_df
     def get_ticker(self, market, date):
-        cond = (self.df['시장'] == market) & (self.df['기준시점'] <= date)
-        return self.df[cond].index.tolist()
+        date = pd.Timestamp(date).strftime("%Y%m%d")
+        dates, entries = self._dates.get(market, []), self._entries.get(market, [])
+        # KRX가 보여주는 순서대로 반환한다
+        found = sorted(entries[:bisect.bisect_right(dates, date)])
+        return [ticker for _, ticker in found]
 
     @fetch_index_df
     def get_name(self, ticker):
-        return self.df.loc[ticker, '지수명']
+        return self._names[ticker]
 
     @fetch_index_df
     def get_market(self, ticker):
-        return self.df.loc[ticker].index['시장']
+        return self._markets[ticker]
+
+    def _build(self, force=False):
+        with self._lock:
+            if self._names is not None and not force:
+                return
+            path = self._file()
+            if not force and os.path.exists(path) and \
+                    time.time() - os.path.getmtime(path) <= self.ttl:
+                with open(path) as f:
+                    records = json.load(f)
+            else:
+                # 02 : KOSPI / 03 : KOSDAQ
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    results = list(executor.map(_fetch_index_master, ["02", "03"]))
+                records = [record for result in results for record in result]
+                if len(records) == 0:
+                    # 조회에 실패한 결과는 저장하지 않고 다음 요청에서 다시 받는다
+                    return
+                write_json(path, records, ensure_ascii=False)
+
+            markets, dates, entries = {}, {}, {}
+            for order, (ticker, name, market, date) in enumerate(records):
+                markets[ticker] = market
+                dates.setdefault(market, []).append((date, order, ticker))
+            for market, rows in dates.items():
+                rows.sort()
+                dates[market] = [date for date, _, _ in rows]
+                entries[market] = [(order, ticker) for _, order, ticker in rows]
+            self._markets = markets
+            self._dates = dates
+            self._entries = entries
+            self._names = {ticker: name for ticker, name, _, _ in records}
+
+    def _file(self):
+        return cache_file(self.path, "ticker", "index.json")
 
 
 if __name__ == "__main__":
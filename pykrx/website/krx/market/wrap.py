@@ -1,4 +1,5 @@
-from pykrx.website.comm import dataframe_empty_handler
+from pykrx.website.comm import dataframe_empty_handler, chunked
+from pykrx.website.comm.parse import parse_frame, parse_date
 from pykrx.website.krx.market.ticker import get_stock_ticker_isin
 from pykrx.website.krx.market.core import (MKD30040, MKD80037, MKD30009_0, MKD30015, MKD81006,
                                            MKD30009_1, MKD20011, MKD20011_SUB, MKD81004, MKD30017,
@@ -13,6 +14,7 @@ import datetime
 
 ################################################################################
 # Market
+@chunked("Y")
 @dataframe_empty_handler
 def get_market_ohlcv_by_date(fromdate, todate, ticker):
     """일자별 OHLCV
@@ -28,16 +30,12 @@ def get_market_ohlcv_by_date(fromdate, todate, ticker):
         20180205     99400   99600   97200   97700   745562
     """
     isin = get_stock_ticker_isin(ticker)
-    df = MKD30040().fetch(fromdate, todate, isin)
-
-    df = df[['trd_dd', 'tdd_opnprc', 'tdd_hgprc', 'tdd_lwprc',
-             'tdd_clsprc', 'acc_trdvol']]
+    df = MKD30040().fetch(fromdate, todate, isin, columns={
+        'trd_dd': str, 'tdd_opnprc': np.int32, 'tdd_hgprc': np.int32, 'tdd_lwprc': np.int32,
+        'tdd_clsprc': np.int32, 'acc_trdvol': np.int64})
     df.columns = ['날짜', '시가', '고가', '저가', '종가', '거래량']
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('날짜')
-    df = df.astype(np.int32)
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -47,16 +45,15 @@ def get_market_ohlcv_by_ticker(date, market):
     df = MKD81004().fetch(date, market)
     df = df[['종목코드', '종목명', '시가', '고가', '저가', '현재가', '거래량', '거래대금', '시가총액', '시가총액비중(%)', '상장주식수']]
     df.columns = ['종목코드', '종목명', '시가', '고가', '저가', '종가', '거래량', '거래대금', '시가총액', '시총비중', '상장주식수']
-    df = df.replace(',', '', regex=True)
-    df = df.replace('', '0', regex=True)
-    df = df.replace('/', '', regex=True)
-    df = df.astype({'종목코드': str, '종목명': str, '시가': np.int32, '고가': np.int32,
-                    '저가': np.int32, '종가': np.int32, '거래량': np.int64, '거래대금': np.int64,
-                    '시가총액': np.int64, '시총비중': np.float16, '상장주식수': np.int64})
+    df = parse_frame(df, {'시가': np.int32, '고가': np.int32, '저가': np.int32, '종가': np.int32,
+                          '거래량': np.int64, '거래대금': np.int64, '시가총액': np.int64,
+                          '시총비중': np.float16, '상장주식수': np.int64})
+    df = df.astype({'종목코드': str, '종목명': str})
     df = df.set_index('종목코드')
     return df
 
 
+@chunked("Y")
 @dataframe_empty_handler
 def get_market_cap_by_date(fromdate, todate, ticker):
     """일자별 OHLCV
@@ -74,16 +71,12 @@ def get_market_cap_by_date(fromdate, todate, ticker):
         2015-07-24  181030885  147299337
         """
     isin = get_stock_ticker_isin(ticker)
-    df = MKD30040().fetch(fromdate, todate, isin)
-
-    df = df[['trd_dd', 'mktcap', 'acc_trdvol', 'acc_trdval', 'list_shrs']]
+    df = MKD30040().fetch(fromdate, todate, isin, columns={
+        'trd_dd': str, 'mktcap': np.int64, 'acc_trdvol': np.int64, 'acc_trdval': np.int64,
+        'list_shrs': np.int64})
     df.columns = ['날짜', '시가총액', '거래량', '거래대금', '상장주식수']
-
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('날짜')
-    df = df.astype(np.int64)
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -108,10 +101,7 @@ def get_market_cap_by_ticker(date, market="ALL"):
     df.columns = ['종목코드', '시가총액', '거래량', '거래대금', '상장주식수', '외국인보유주식수']
 
     df = df.set_index('종목코드')
-    df = df.replace(np.NaN, 0)
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype(np.int64)
+    df = parse_frame(df, np.int64)
     return df
 
 
@@ -141,10 +131,9 @@ def get_market_price_change_by_ticker(fromdate, todate, market="ALL"):
                   '등락률', '거래량', '거래대금']
     df = df.set_index('티커')
 
-    df = df.replace(',', '', regex=True)
-    df = df.astype({"시가": np.int32, "종가": np.int32,
-                    "변동폭": np.int32, "등락률": np.float64,
-                    "거래량": np.int64, "거래대금": np.int64})
+    df = parse_frame(df, {"시가": np.int32, "종가": np.int32,
+                          "변동폭": np.int32, "등락률": np.float64,
+                          "거래량": np.int64, "거래대금": np.int64})
     return df
 
 
@@ -170,14 +159,12 @@ def get_market_fundamental_by_ticker(date, market="ALL"):
     df.columns = ['종목명', '티커', 'DIV', 'BPS', 'PER', 'EPS']
     df.set_index('티커', inplace=True)
 
-    df = df.replace('-', '0', regex=True)
-    df = df.replace('', '0', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype({"종목명": str, "DIV": np.float64, "BPS": np.int32,
-                    "PER": np.float64, "EPS": np.int32}, )
+    df = parse_frame(df, {"DIV": np.float64, "BPS": np.int32,
+                          "PER": np.float64, "EPS": np.int32})
     return df
 
 
+@chunked("Y")
 @dataframe_empty_handler
 def get_market_fundamental_by_date(fromdate, todate, isin, market="ALL"):
     """일자별 BPS/PER/PBR/배당수익률
@@ -194,18 +181,12 @@ def get_market_fundamental_by_date(fromdate, todate, isin, market="ALL"):
     """
     market = {"ALL": "ALL", "KOSPI": "STK", "KOSDAQ": "KSQ", "KONEX": "KNX"}.\
         get(market, "ALL")    
-    df = MKD30009_1().fetch(fromdate, todate, market, isin)
-    df = df[['work_dt', 'dvd_yld', 'bps', 'per', 'prv_eps']]
+    df = MKD30009_1().fetch(fromdate, todate, market, isin, columns={
+        'work_dt': str, 'dvd_yld': np.float64, 'bps': np.int32, 'per': np.float64,
+        'prv_eps': np.int32})
     df.columns = ['날짜', 'DIV', 'BPS', 'PER', 'EPS']
-    
-    df = df.replace('-', '0', regex=True)
-    df = df.replace('/', '', regex=True)
-    df = df.replace('', '0', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype({"DIV": np.float64, "BPS": np.int32,
-                    "PER": np.float64, "EPS": np.int32}, )
     df = df.set_index('날짜')
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -318,13 +299,10 @@ def get_market_trading_value_and_volume_by_ticker(date, market, investor, market
 
     df = MKD30017().fetch(date, market, investor, market_detail)
     df = df[df.columns[:-1]]
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype(
-        {'종목코드': str, '종목명': str, '매수거래량': np.int32, '매도거래량': np.int32,
-         '순매수거래량': np.int32, '매수거래대금': np.int64, '매도거래대금': np.int64,
-         '순매수거래대금': np.int64})
-    df['종목코드'] = df['종목코드'].apply(lambda x: x.zfill(6))
+    df = parse_frame(
+        df, {'매수거래량': np.int64, '매도거래량': np.int64, '순매수거래량': np.int64,
+             '매수거래대금': np.int64, '매도거래대금': np.int64, '순매수거래대금': np.int64})
+    df['종목코드'] = df['종목코드'].astype(str).str.zfill(6)
     return df.set_index('종목코드')
 
 
@@ -347,16 +325,15 @@ def get_exhaustion_rates_of_foreign_investment_by_ticker(date, market, balance_l
     df = MKD81006().fetch(date, market, balance_limit)
     df = df[['종목코드', '상장주식수', '외국인한도수량', '외국인보유수량', '외국인한도소진률(%)']]
     df.columns = ['종목코드', '상장주식수', '한도수량', '보유수량', '소진률']
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype(
-        {'종목코드': str, '상장주식수': np.int64, '한도수량': np.int64, '보유수량': np.int64, '소진률': np.float16})
-    df['종목코드'] = df['종목코드'].apply(lambda x: x.zfill(6))
+    df = parse_frame(
+        df, {'상장주식수': np.int64, '한도수량': np.int64, '보유수량': np.int64, '소진률': np.float16})
+    df['종목코드'] = df['종목코드'].astype(str).str.zfill(6)
     return df.set_index('종목코드')
 
 
 ################################################################################
 # index
+@chunked("Y")
 @dataframe_empty_handler
 def get_index_ohlcv_by_date(fromdate, todate, ticker):
     """
@@ -382,18 +359,12 @@ def get_index_ohlcv_by_date(fromdate, todate, ticker):
         20190130  2183.489990  2206.199951  2177.879883  2206.199951  480390000
         20190131  2222.879883  2222.879883  2201.219971  2204.850098  545248000
     """
-    df = MKD20011_SUB().fetch(fromdate, todate, ticker[1:], ticker[0])
-    df = df[['trd_dd', 'opnprc_idx', 'hgprc_idx', 'lwprc_idx',
-             'clsprc_idx', 'acc_trdvol']]
+    df = MKD20011_SUB().fetch(fromdate, todate, ticker[1:], ticker[0], columns={
+        'trd_dd': str, 'opnprc_idx': np.float64, 'hgprc_idx': np.float64,
+        'lwprc_idx': np.float64, 'clsprc_idx': np.float64, 'acc_trdvol': np.int64})
     df.columns = ['날짜', '시가', '고가', '저가', '종가', '거래량']
-    df = df.replace(',', '', regex=True)
-    df = df.replace('', '0', regex=True)
-    df = df.replace('/', '', regex=True)
     df = df.set_index('날짜')
-    df = df.astype({'시가': np.float64, '고가': np.float64,
-                    '저가': np.float64, '종가': np.float64,
-                    '거래량': np.int64})
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df.index = parse_date(df.index)
     df['거래량'] = df['거래량'] * 1000
     return df
 
@@ -416,9 +387,7 @@ def get_index_status_by_group(date, market):
     df = df[['idx_nm', 'annc_tm', 'bas_tm', 'bas_idx', 'prsnt_prc', 'idx_mktcap']]
     df.columns = ['지수명', '기준시점', '발표시점', '기준지수', '현재지수', '시가총액']
     df = df.set_index('지수명')
-    df = df.replace(',', '', regex=True)
-    df = df.replace('', 0)
-    df = df.astype({"기준지수": float, "현재지수": float, "시가총액": int}, )
+    df = parse_frame(df, {"기준지수": np.float64, "현재지수": np.float64, "시가총액": np.int64})
     return df
 
 
@@ -441,9 +410,8 @@ def get_index_price_change_by_name(fromdate, todate, market):
     df = df[['kor_indx_ind_nm', 'indx', 'prv_dd_indx', 'updn_rate', 'tr_vl', 'tr_amt']]
     df.columns = ['지수명', '시가', '종가', '등락률', '거래량', '거래대금']
     df = df.set_index('지수명')
-    df = df.replace(',', '', regex=True)
-    df = df.replace('', 0)
-    df = df.astype({"시가": float, "종가": float, "등락률": float, "거래량": np.int64, "거래대금": np.int64})
+    df = parse_frame(df, {"시가": np.float64, "종가": np.float64, "등락률": np.float64,
+                          "거래량": np.int64, "거래대금": np.int64})
     return df
 
 
@@ -480,10 +448,8 @@ def _get_index_volume_by_date(df):
     df = df[sort_idx]
     df.columns = pd.MultiIndex.from_tuples(list(zip(category, columns)))
 
-    df = df.replace(',', '', regex=True)
-    df = df.replace('', 0)
-    df = df.astype(np.int64)
-    df.index = pd.to_datetime(df.index, format='%Y/%m/%d')
+    df = parse_frame(df, np.int64)
+    df.index = parse_date(df.index)
     return df
 
 
@@ -523,13 +489,10 @@ def get_shorting_status_by_date(fromdate, todate, isin):
     df = df[['trd_dd', 'cvsrtsell_trdvol', 'str_const_val1',
              'cvsrtsell_trdval', 'str_const_val2']]
     df.columns = ['날짜', '공매도', '잔고', '공매도금액', '잔고금액']
-    df = df.replace('/', '', regex=True)
     df = df.set_index('날짜')
-    df = df.replace('-', '0', regex=True)
-    df = df.replace(',', '', regex=True)
-    df = df.astype({"공매도": np.int32, "잔고": np.int32,
-                    "공매도금액": np.int64, "잔고금액": np.int64})
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df = parse_frame(df, {"공매도": np.int64, "잔고": np.int64,
+                          "공매도금액": np.int64, "잔고금액": np.int64})
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -550,11 +513,10 @@ def get_shorting_volume_by_date(fromdate, todate, isin, market):
     df = SRT02020100().fetch(fromdate, todate, market, isin)
 
     df = df[['일자', '공매도거래량', '총거래량', '비중', '공매도거래대금']]
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('일자')
-    df = df.astype({"공매도거래량": np.int64, "총거래량": np.int64,
-                    "공매도거래대금": np.int64, "비중": np.float64})
+    df.index = df.index.astype(str).str.replace('/', '', regex=False)
+    df = parse_frame(df, {"공매도거래량": np.int64, "총거래량": np.int64,
+                          "공매도거래대금": np.int64, "비중": np.float64})
     return df.sort_index()
 
 
@@ -575,12 +537,10 @@ def get_shorting_volume_by_ticker(date, market="코스피"):
     df = SRT02020100().fetch(date, date, market, "")
 
     df = df[['종목코드', '공매도거래량', '총거래량', '비중', '공매도거래대금']]
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('종목코드')
     df.index = df.index.str[3:9]
-    df = df.astype({"공매도거래량": np.int64, "총거래량": np.int64,
-                    "공매도거래대금": np.int64, "비중": np.float64})
+    df = parse_frame(df, {"공매도거래량": np.int64, "총거래량": np.int64,
+                          "공매도거래대금": np.int64, "비중": np.float64})
     return df
 
 
@@ -608,10 +568,9 @@ def get_shorting_investor_by_date(fromdate, todate, market, inquery="거래량")
          'str_const_val5', 'trd_dd']]
     df.columns = ['기관', '개인', '외국인', '기타', '합계', '날짜']
 
-    df = df.replace('/', '', regex=True)
     df = df.set_index('날짜')
-    df = df.replace(',', '', regex=True).astype(np.int64)
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
+    df = parse_frame(df, np.int64)
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -639,17 +598,15 @@ def get_shorting_volume_top50(date, market="코스피"):
                   '공매도거래대금증가율', '직전40일공매도평균비중', '공매도비중증가율', '주가수익률']
     df = df.set_index('종목명')
 
-    df = df.replace(',', '', regex=True)
-    df = df.replace(r'^\s*$', 0, regex=True)
-
-    df = df.astype({"순위": np.int32, "공매도거래대금": np.int64, "총거래대금": np.int64,
-                    "직전40일거래대금평균": np.int64, "공매도비중": np.float64,
-                    "공매도거래대금증가율": np.float64,
-                    "직전40일공매도평균비중": np.float64, "공매도비중증가율": np.float64,
-                    "주가수익률": np.float64})
+    df = parse_frame(df, {"순위": np.int32, "공매도거래대금": np.int64, "총거래대금": np.int64,
+                          "직전40일거래대금평균": np.int64, "공매도비중": np.float64,
+                          "공매도거래대금증가율": np.float64,
+                          "직전40일공매도평균비중": np.float64, "공매도비중증가율": np.float64,
+                          "주가수익률": np.float64})
     return df
 
 
+@chunked("Y")
 @dataframe_empty_handler
 def get_shorting_balance_by_date(fromdate, todate, isin, market="KOSPI"):
     """종목별 공매도 잔고 현황
@@ -670,12 +627,10 @@ def get_shorting_balance_by_date(fromdate, todate, isin, market="KOSPI"):
     df = df[['공시의무발생일', '공매도잔고수량', '상장주식수', '공매도잔고금액', '시가총액', '비중']]
     df.columns = ['날짜', '공매도잔고', '상장주식수', '공매도금액', '시가총액', '비중']
 
-    df = df.replace('/', '', regex=True)
-    df = df.replace(',', '', regex=True)
     df = df.set_index('날짜')
-    df = df.astype({"공매도잔고": np.int32, "상장주식수": np.int64, "공매도금액": np.int64,
-                    "시가총액": np.int64, "비중": np.float64})
-    df.index = pd.to_datetime(df.index, format='%Y/%m/%d')
+    df = parse_frame(df, {"공매도잔고": np.int64, "상장주식수": np.int64, "공매도금액": np.int64,
+                          "시가총액": np.int64, "비중": np.float64})
+    df.index = parse_date(df.index)
     return df.sort_index()
 
 
@@ -701,10 +656,9 @@ def get_shorting_balance_top50(date, market="KOSPI"):
     df['티커'] = df.티커.str[3:9]
     df = df.set_index('티커')
 
-    df = df.replace(',', '', regex=True)
-    df = df.astype(
-        {"잔고수량": np.int32, "주식수": np.int64, "잔고금액": np.int64, "시가총액": np.int64,
-         "비중": np.float64})
+    df = parse_frame(
+        df, {"잔고수량": np.int64, "주식수": np.int64, "잔고금액": np.int64, "시가총액": np.int64,
+             "비중": np.float64})
     return df
 
 
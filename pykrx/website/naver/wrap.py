@@ -1,32 +1,90 @@
 from pykrx.website.naver.core import Sise
+from pykrx.website.krx.calendar import trading_days, CalendarError
 import xml.etree.ElementTree as et
 from pandas import DataFrame
 import pandas as pd
 import numpy as np
-from datetime import datetime
+import datetime
 
-# fromdate, todate, isin
-def get_market_ohlcv_by_date(fromdate, todate, ticker):
-    strtd = datetime.strptime(fromdate, '%Y%m%d')
-    lastd = datetime.strptime(todate, '%Y%m%d')
-    today = datetime.now()
-    elapsed = today - strtd
-    xml = Sise().fetch(ticker, elapsed.days)
+COLUMNS = ['시가', '고가', '저가', '종가', '거래량']
+# Sise timeframe 별 pandas period
+PERIODS = {'week': 'W', 'month': 'M'}
 
-    result = []
+
+def _count(fromdate, timeframe='day'):
+    """fromdate 부터 오늘까지의 봉 개수의 상한
+
+    Sise 는 오늘부터 거슬러 올라가며 count 개의 봉을 반환하므로 조회 시작일
+    이후의 거래일(주/월) 수만큼만 요청한다. 거래일은 KRX 거래일 달력으로 세고,
+    장중에 오늘 봉이 먼저 생길 수 있으므로 하나를 더 요청한다.
+    """
+    today = datetime.date.today()
+    strtd = datetime.datetime.strptime(fromdate, '%Y%m%d').date()
+    if timeframe == 'week':
+        return (today - strtd).days // 7 + 2
+    if timeframe == 'month':
+        return (today.year - strtd.year) * 12 + today.month - strtd.month + 1
+    try:
+        return len(trading_days(fromdate, today.strftime('%Y%m%d'))) + 1
+    except CalendarError:
+        # 달력을 만들 수 없으면 항상 상한인 평일 수를 사용
+        return int(np.busday_count(strtd, today + datetime.timedelta(days=1)))
+
+
+def _parse(xml, fromdate, todate, size):
+    """Sise XML 에서 [fromdate, todate] 구간의 봉만 읽는다
+    응답 크기는 count 로 제한하므로 XML 은 한 번에 읽고, 구간 밖의 봉은 배열에
+    옮기지 않는다.
+    :param xml : Sise 응답
+    :param size: 예상되는 최대 봉 개수
+    :return    : 날짜 문자열 리스트, (n, 5) int64 배열
+    """
+    dates = []
+    values = np.empty((max(size, 1), len(COLUMNS)), dtype=np.int64)
     for node in et.fromstring(xml).iter(tag='item'):
-        row = node.get('data')
-        result.append(row.split("|"))
+        row = node.get('data').split("|")
+        if not fromdate <= row[0] <= todate:
+            continue
+        if len(dates) == len(values):
+            values = np.resize(values, (len(values) * 2, len(COLUMNS)))
+        values[len(dates)] = row[1:6]
+        dates.append(row[0])
+    return dates, values[:len(dates)]
+
+
+def get_market_ohlcv_by_date(fromdate, todate, ticker, timeframe='day'):
+    """Naver 수정주가 OHLCV
+    :param fromdate : 조회 시작 일자 (YYYYMMDD)
+    :param todate   : 조회 종료 일자 (YYYYMMDD)
+    :param ticker   : 티커
+    :param timeframe: day - 일봉 / week - 주봉 / month - 월봉
+                      주봉과 월봉은 resample 과 같이 기간의 마지막 날로 표시되고
+                      조회 기간이 걸쳐 있는 주/월의 봉 전체를 반환한다
+    :return         : OHLCV DataFrame
+    """
+    count = _count(fromdate, timeframe)
+    if count <= 0:
+        return DataFrame(columns=COLUMNS)
+    xml = Sise().fetch(ticker, count, timeframe)
+
+    period = PERIODS.get(timeframe)
+    if period is not None:
+        # 봉의 날짜는 기간 안의 거래일이므로 기간 단위로 구간을 넓혀서 거른다
+        fromdate = pd.Timestamp(fromdate).to_period(period).start_time.strftime('%Y%m%d')
+        todate = pd.Timestamp(todate).to_period(period).end_time.strftime('%Y%m%d')
 
-    cols = ['날짜', '시가', '고가', '저가', '종가', '거래량']
-    df = DataFrame(result, columns=cols)
-    df = df.set_index('날짜')
-    df.index = pd.to_datetime(df.index, format='%Y%m%d')
-    df = df.astype(np.int32)
-    return df.loc[(strtd <= df.index) & (df.index <= lastd)]
+    dates, values = _parse(xml, fromdate, todate, count)
+    index = pd.to_datetime(dates, format='%Y%m%d')
+    if period is not None:
+        index = index.to_period(period).to_timestamp(how='end').normalize()
+    # 가격은 int32, 거래량은 int32 범위를 넘을 수 있으므로 int64 로 둔다
+    df = DataFrame(values, columns=COLUMNS, index=index)
+    df = df.astype({column: np.int32 for column in COLUMNS[:4]})
+    df.index.name = '날짜'
+    return df
 
 
 if __name__ == "__main__":
     # df = get_market_ohlcv_by_date("20010101", "20190820", "005930")
     df = get_market_ohlcv_by_date("20200226", "20200227", "000020")
-    print(df)
\ No newline at end of file
+    print(df)
@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from pykrx.website.krx import calendar
+from pykrx.website.krx.calendar import TradingCalendar, CalendarError
+from pykrx.website.naver import wrap
+
+HOLIDAYS = ["20200101", "20200124", "20200127"]
+
+
+def _index_ohlcv(fromdate, todate, ticker):
+    days = [d for d in pd.bdate_range(fromdate, todate) if d.strftime("%Y%m%d") not in HOLIDAYS]
+    return pd.DataFrame({'종가': [2000.0] * len(days)}, index=pd.DatetimeIndex(days, name='날짜'))
+
+
+class TradingCalendarTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.calendar = TradingCalendar()
+        self.calendar.configure(path=self.path)
+        self.calendar.start = "20200101"
+        self.patch = mock.patch.object(calendar, "get_index_ohlcv_by_date", side_effect=_index_ohlcv)
+        self.fetch = self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        del self.calendar.start
+        self.calendar.path = None
+        self.calendar._days = None
+        self.calendar._today = None
+        self.calendar._tail = None
+        shutil.rmtree(self.path)
+
+    def test_queries(self):
+        self.assertEqual(self.calendar.trading_days("20200101", "20200107"),
+                         ["20200102", "20200103", "20200106", "20200107"])
+        self.assertFalse(self.calendar.is_trading_day("20200124"))
+        self.assertTrue(self.calendar.is_trading_day("20200128"))
+        self.assertEqual(self.calendar.prev_trading_day("20200128"), "20200123")
+        self.assertEqual(self.calendar.next_trading_day("20200123"), "20200128")
+        self.assertEqual(self.calendar.nearest_business_day("20200126"), "20200123")
+
+    def test_history_is_persisted_and_extended(self):
+        self.calendar.trading_days("20200101", "20200131")
+        # 다른 프로세스처럼 메모리의 달력을 비우고 같은 구간을 조회
+        self.calendar._days = None
+        self.fetch.reset_mock()
+        self.calendar.trading_days("20200101", "20200131")
+        self.assertEqual(self.fetch.call_count, 0)
+        # 저장된 마지막 날짜 이후만 받는다
+        self.calendar.trading_days("20200101", "20200214")
+        self.assertEqual(self.fetch.call_args_list, [mock.call("20200201", "20200214", "1001")])
+
+    def test_incomplete_calendar_raises(self):
+        # 2021년 구간이 조회 오류로 비어 있으면 2021년 이후는 답하지 않는다
+        def throttled(fromdate, todate, ticker):
+            return _index_ohlcv(fromdate, todate, ticker).iloc[:0] if fromdate[:4] == "2021" \
+                else _index_ohlcv(fromdate, todate, ticker)
+        self.fetch.side_effect = throttled
+        self.assertTrue(self.calendar.is_trading_day("20200102"))
+        self.assertRaises(CalendarError, self.calendar.is_trading_day, "20210310")
+        self.assertRaises(CalendarError, self.calendar.trading_days, "20200101", "20220101")
+        # 조회가 다시 성공하면 이어서 받는다
+        self.fetch.side_effect = _index_ohlcv
+        self.assertTrue(self.calendar.is_trading_day("20210310"))
+
+    def test_empty_first_chunk_raises(self):
+        # 이력의 첫 구간이 비어 있으면 건너뛰지 않고 다음 조회에서 다시 받는다
+        def throttled(fromdate, todate, ticker):
+            df = _index_ohlcv(fromdate, todate, ticker)
+            return df.iloc[:0] if fromdate[:4] == "2020" else df
+        self.fetch.side_effect = throttled
+        self.assertRaises(CalendarError, self.calendar.trading_days, "20200101", "20210131")
+        self.fetch.side_effect = _index_ohlcv
+        self.assertEqual(self.calendar.trading_days("20200101", "20200107"),
+                         ["20200102", "20200103", "20200106", "20200107"])
+
+    def test_network_error_raises(self):
+        self.fetch.side_effect = IOError("connection refused")
+        self.assertRaises(CalendarError, self.calendar.trading_days, "20200101", "20200131")
+
+    def test_holidays_at_the_end(self):
+        HOLIDAYS.extend(["20200224", "20200225"])
+        try:
+            self.assertEqual(self.calendar.trading_days("20200220", "20200221"), ["20200220", "20200221"])
+            self.assertEqual(self.calendar.trading_days("20200220", "20200225"), ["20200220", "20200221"])
+        finally:
+            del HOLIDAYS[-2:]
+
+    def test_naver_count_falls_back_to_weekdays(self):
+        self.fetch.side_effect = IOError("connection refused")
+        self.assertEqual(wrap._count("20240101"),
+                         pd.bdate_range("20240101", pd.Timestamp.today().normalize()).size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,484 @@
+import io
+import os
+import asyncio
+import datetime
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from http.server import HTTPServer, BaseHTTPRequestHandler
+import numpy as np
+import requests
+import pandas as pd
+from pykrx.website.comm import chunked, SessionPool, ThreadedExecutor, RequestPolicy, CircuitOpenError
+from pykrx.website.comm.cache import ResponseCache
+from pykrx.website.comm.parse import parse_number, parse_frame, parse_date, records_to_frame
+from pykrx.website.comm.ratelimit import TokenBucket, AdaptiveLimiter
+from pykrx.website.comm.util import split_date_range, cache_file, file_lock, write_file, write_json
+from pykrx.website.comm.retry import RetryPolicy, CircuitBreaker
+from pykrx.website.comm.singleflight import SingleFlight
+from pykrx.website.comm import webio
+from pykrx.website.comm.webio import Get
+from pykrx.website.krx.krxio import OtpManager, KrxFileIo, read_table, _has_records
+
+
+class SessionPoolTest(unittest.TestCase):
+    def tearDown(self):
+        SessionPool().close()
+
+    def test_session_is_shared_per_host(self):
+        pool = SessionPool()
+        a = pool.get("http://marketdata.krx.co.kr/contents/COM/GenerateOTP.jspx")
+        b = pool.get("http://marketdata.krx.co.kr/contents/MKD/99/MKD99000001.jspx")
+        c = pool.get("http://fchart.stock.naver.com/sise.nhn")
+        self.assertIs(a, b)
+        self.assertIsNot(a, c)
+
+    def test_pool_size(self):
+        pool = SessionPool()
+        pool.set_pool_size("file.krx.co.kr", 3)
+        session = pool.get("http://file.krx.co.kr/download.jspx")
+        self.assertEqual(session.get_adapter("http://file.krx.co.kr")._pool_maxsize, 3)
+
+    def test_close(self):
+        with SessionPool() as pool:
+            a = pool.get("http://marketdata.krx.co.kr")
+        self.assertIsNot(a, SessionPool().get("http://marketdata.krx.co.kr"))
+
+
+class _FakeOtp:
+    url = "http://localhost/otp"
+
+    def __init__(self):
+        self.issued = 0
+
+    def read(self, **params):
+        self.issued += 1
+        resp = type("Response", (), {})()
+        resp.text = "otp{}".format(self.issued)
+        return resp
+
+
+class OtpManagerTest(unittest.TestCase):
+    def test_token_is_reused_per_bld(self):
+        otp = _FakeOtp()
+        manager = OtpManager()
+        self.assertEqual(manager.get(otp, name="form", bld="a"), "otp1")
+        self.assertEqual(manager.get(otp, name="form", bld="a"), "otp1")
+        self.assertEqual(manager.get(otp, name="form", bld="b"), "otp2")
+        self.assertEqual(otp.issued, 2)
+
+    def test_invalidate(self):
+        otp = _FakeOtp()
+        manager = OtpManager()
+        manager.get(otp, name="form", bld="c")
+        manager.invalidate(otp, name="form", bld="c")
+        self.assertEqual(manager.get(otp, name="form", bld="c"), "otp2")
+
+    def test_prefetch(self):
+        otp = _FakeOtp()
+        manager = OtpManager()
+        manager.prefetch(otp, name="fileDown", url="d").result()
+        self.assertEqual(manager.get(otp, name="fileDown", url="d"), "otp1")
+        self.assertEqual(otp.issued, 1)
+
+    def test_issue_is_not_stored(self):
+        otp = _FakeOtp()
+        manager = OtpManager()
+        count = len(manager._tokens)
+        self.assertEqual(manager.issue(otp, name="fileDown", url="e", fromdate="20200101"), "otp1")
+        self.assertEqual(manager.issue(otp, name="fileDown", url="e", fromdate="20200101"), "otp2")
+        self.assertEqual(len(manager._tokens), count)
+
+
+class ThreadedExecutorTest(unittest.TestCase):
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(x):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+            return x * 2
+
+        async def main():
+            return await asyncio.gather(*[ThreadedExecutor().run(work, x) for x in range(20)])
+
+        ThreadedExecutor().set_max_workers(4)
+        try:
+            result = asyncio.run(main())
+        finally:
+            ThreadedExecutor().set_max_workers(16)
+        self.assertEqual(result, [x * 2 for x in range(20)])
+        self.assertLessEqual(state["peak"], 4)
+
+
+class RateLimitTest(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(rate=1000, concurrency=2, max_concurrency=4)
+        for _ in range(20):
+            limiter.acquire()
+            limiter.release(0.01)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_multiplicative_decrease(self):
+        limiter = AdaptiveLimiter(rate=1000, concurrency=8)
+        limiter.acquire()
+        limiter.release(0.01, ok=False)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_slow_response_decreases(self):
+        limiter = AdaptiveLimiter(rate=1000, concurrency=8, slow=4.0)
+        limiter.acquire()
+        limiter.release(0.01)
+        limiter.acquire()
+        limiter.release(1.0)
+        self.assertEqual(limiter.limit, 4)
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    # 처음 failures 번은 503을 반환
+    failures = 0
+    requests = 0
+
+    def do_GET(self):
+        _FlakyHandler.requests += 1
+        status = 503 if _FlakyHandler.requests <= _FlakyHandler.failures else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class _LocalGet(Get):
+    def __init__(self, url):
+        self._url = url
+
+    @property
+    def url(self):
+        return self._url
+
+
+class RetryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), _FlakyHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = "http://127.0.0.1:{}/".format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _FlakyHandler.requests = 0
+        RequestPolicy().configure("127.0.0.1", retries=2, backoff=0.001, failure_threshold=2,
+                                  reset_timeout=60)
+
+    def test_transient_failure_is_retried(self):
+        _FlakyHandler.failures = 1
+        resp = _LocalGet(self.url).read()
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(_FlakyHandler.requests, 2)
+
+    def test_circuit_opens(self):
+        _FlakyHandler.failures = 100
+        with self.assertRaises(CircuitOpenError):
+            _LocalGet(self.url).read()
+        # 연속 두 번 실패한 뒤에는 요청을 보내지 않는다
+        self.assertEqual(_FlakyHandler.requests, 2)
+        with self.assertRaises(CircuitOpenError):
+            _LocalGet(self.url).read()
+        self.assertEqual(_FlakyHandler.requests, 2)
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff=1, max_backoff=3)
+        for attempt in range(10):
+            self.assertLessEqual(policy.delay(attempt), 3)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record(False)
+        self.assertEqual(breaker.state, "half-open")
+        breaker.check()
+        with self.assertRaises(CircuitOpenError):
+            breaker.check()
+        breaker.record(True)
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_trial_is_recorded(self):
+        RequestPolicy().configure("127.0.0.1", retries=0, failure_threshold=1, reset_timeout=0)
+        _FlakyHandler.failures = 1
+        self.assertEqual(_LocalGet(self.url).read().status_code, 503)
+        # half-open 의 시험 요청이 재시도하지 않는 오류로 끝나도 다음 시험 요청을 허용한다
+        error = requests.exceptions.ContentDecodingError("bad gzip")
+        with mock.patch.object(webio, "_send", side_effect=error):
+            self.assertRaises(requests.exceptions.ContentDecodingError, _LocalGet(self.url).read)
+        self.assertEqual(_LocalGet(self.url).read().status_code, 200)
+
+    def test_chunked_encoding_error_is_retried(self):
+        send = webio._send
+        calls = []
+
+        def truncated(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                raise requests.exceptions.ChunkedEncodingError("connection broken")
+            return send(*args, **kwargs)
+        with mock.patch.object(webio, "_send", side_effect=truncated):
+            self.assertEqual(_LocalGet(self.url).read().status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache()
+        self.cache.configure(enabled=True, path=os.path.join(self.tmp.name, "cache.sqlite"),
+                             max_size=512 * 1024 * 1024)
+
+    def tearDown(self):
+        self.cache._close()
+        self.cache.path = None
+        self.tmp.cleanup()
+
+    def test_key_ignores_otp(self):
+        a = ResponseCache.key("url", "bld", {"fromdate": "20200101", "code": "otp1"})
+        b = ResponseCache.key("url", "bld", {"fromdate": "20200101", "code": "otp2"})
+        c = ResponseCache.key("url", "bld", {"fromdate": "20200102", "code": "otp1"})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_past_range_is_immutable(self):
+        self.assertIsNone(self.cache.expires({"fromdate": "20200101", "todate": "20200131"}))
+        today = datetime.date.today().strftime("%Y%m%d")
+        self.assertIsNotNone(self.cache.expires({"fromdate": "20200101", "todate": today}))
+        self.assertIsNotNone(self.cache.expires({"mktsel": "ALL"}))
+
+    def test_get_and_expire(self):
+        self.cache.set("a", b"payload")
+        self.cache.set("b", b"payload", expires=0)
+        self.assertEqual(self.cache.get("a"), b"payload")
+        self.assertIsNone(self.cache.get("b"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"] >= 1), (2, True))
+
+    def test_lru_eviction(self):
+        self.cache.configure(max_size=1000)
+        payload = os.urandom(400)
+        self.cache.set("a", payload)
+        self.cache.set("b", payload)
+        self.cache.get("a")
+        self.cache.set("c", payload)
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_empty_records_are_not_cached(self):
+        self.assertFalse(_has_records({"block1": []}))
+        self.assertFalse(_has_records({"output": [], "CURRENT_DATETIME": "2020.01.02"}))
+        self.assertTrue(_has_records({"output": [{"isu_cd": "KR7005930003"}]}))
+        self.assertTrue(_has_records({"result": {"code": "0"}}))
+
+
+class CacheFileTest(unittest.TestCase):
+    def test_cache_file(self):
+        path = tempfile.mkdtemp()
+        name = cache_file(path, "ticker", "store", "2020", "005930.json")
+        self.assertEqual(name, os.path.join(path, "store", "2020", "005930.json"))
+        self.assertTrue(os.path.isdir(os.path.dirname(name)))
+
+    def test_failed_write_keeps_old_file(self):
+        path = os.path.join(tempfile.mkdtemp(), "data.json")
+        write_json(path, [1, 2])
+
+        def writer(tmp):
+            with open(tmp, "w") as f:
+                f.write("[")
+            raise IOError("disk full")
+        self.assertRaises(IOError, write_file, path, writer)
+        with open(path) as f:
+            self.assertEqual(f.read(), "[1, 2]")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["data.json"])
+
+    def test_file_lock(self):
+        path = os.path.join(tempfile.mkdtemp(), "coverage.json")
+        events = []
+
+        def worker():
+            with file_lock(path):
+                events.append("worker")
+        with file_lock(path):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            time.sleep(0.1)
+            events.append("main")
+        thread.join()
+        self.assertEqual(events, ["main", "worker"])
+
+
+class ChunkTest(unittest.TestCase):
+    def test_split_date_range(self):
+        self.assertEqual(split_date_range("20181101", "20190415", "Q"),
+                         [("20181101", "20181231"), ("20190101", "20190331"),
+                          ("20190401", "20190415")])
+        self.assertEqual(split_date_range("20190105", "20190105", "Y"), [("20190105", "20190105")])
+
+    def test_chunks_are_merged_in_order(self):
+        calls = []
+
+        @chunked("Y")
+        def fetch(fromdate, todate):
+            calls.append((fromdate, todate))
+            index = pd.date_range(fromdate, todate, freq="MS")
+            return pd.DataFrame({"v": range(len(index))}, index=index)
+
+        df = fetch("20170101", "20191231")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(df), 36)
+        self.assertTrue(df.index.is_monotonic_increasing)
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_calls_share_one_result(self):
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {"output": [1, 2, 3]}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(SingleFlight().do("k", fetch)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_error_is_shared_and_key_released(self):
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise IOError("boom")
+
+        def call():
+            try:
+                SingleFlight().do("e", fail)
+            except IOError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        threads[0].start()
+        started.wait()
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(SingleFlight().do("e", lambda: 1), 1)
+
+
+class ParseTest(unittest.TestCase):
+    def test_krx_number_strings(self):
+        df = pd.DataFrame({"종목명": ["A", "B", "C", "D"],
+                           "종가": ["1,234", "-", "", "-1,500"],
+                           "비중": ["0.25", "", "1,000.5", "-"]})
+        df = parse_frame(df, {"종가": np.int32, "비중": np.float64})
+        self.assertEqual(df["종가"].dtype, np.int32)
+        self.assertEqual(df["종가"].tolist(), [1234, 0, 0, -1500])
+        self.assertEqual(df["비중"].tolist(), [0.25, 0.0, 1000.5, 0.0])
+        self.assertEqual(df["종목명"].tolist(), ["A", "B", "C", "D"])
+
+    def test_mixed_values(self):
+        df = pd.DataFrame({"v": ["1,000", 25, np.nan, "7.00"]}, dtype=object)
+        self.assertEqual(parse_frame(df, np.int64)["v"].tolist(), [1000, 25, 0, 7])
+
+    def test_integer_overflow(self):
+        self.assertRaises(OverflowError, parse_number, ["3,000,000,000"], np.int32)
+        self.assertEqual(parse_number(["3,000,000,000"], np.int64).tolist(), [3000000000])
+
+    def test_dates(self):
+        index = pd.Index(["2019/03/29", "20190328"])
+        self.assertEqual(parse_date(index).tolist(),
+                         [pd.Timestamp(2019, 3, 29), pd.Timestamp(2019, 3, 28)])
+
+    def test_records_to_frame(self):
+        records = [{"trd_dd": "2019/03/29", "tdd_clsprc": "44,650", "fluc_tp": "1"},
+                   {"trd_dd": "2019/03/28", "tdd_clsprc": "-", "fluc_tp": "2"}]
+        df = records_to_frame(records, {"trd_dd": str, "tdd_clsprc": np.int32})
+        self.assertEqual(list(df.columns), ["trd_dd", "tdd_clsprc"])
+        self.assertEqual(df["tdd_clsprc"].dtype, np.int32)
+        self.assertEqual(df["tdd_clsprc"].tolist(), [44650, 0])
+        self.assertEqual(len(records_to_frame([], {"trd_dd": str})), 0)
+
+
+class _FakeFileIo(KrxFileIo):
+    bld = "TEST/file"
+    requests = []
+    csv = b""
+
+    def _download(self, key, otp_params, params):
+        self.requests.append(otp_params["filetype"])
+        if otp_params["filetype"] == "csv":
+            return self.csv
+        return b"\xd0\xcf\x11\xe0"
+
+    def fetch(self):
+        return self.post()
+
+
+class FileIoTest(unittest.TestCase):
+    def setUp(self):
+        _FakeFileIo.requests = []
+        KrxFileIo._xls_only.discard(_FakeFileIo.bld)
+
+    def test_read_csv_as_text(self):
+        text = "종목코드,종목명,현재가\n005930,삼성전자,\"45,050\"\n"
+        df = read_table(io.BytesIO(text.encode("cp949")))
+        self.assertEqual(df["종목코드"].tolist(), ["005930"])
+        self.assertEqual(df["현재가"].tolist(), ["45,050"])
+
+    def test_fallback_to_xls(self):
+        _FakeFileIo().fetch()
+        _FakeFileIo().fetch()
+        self.assertEqual(_FakeFileIo.requests, ["csv", "xls", "xls"])
+
+    def test_error_page_keeps_csv(self):
+        _FakeFileIo.csv = b"<html>Service Unavailable</html>"
+        try:
+            _FakeFileIo().fetch()
+            _FakeFileIo().fetch()
+        finally:
+            _FakeFileIo.csv = b""
+        self.assertEqual(_FakeFileIo.requests, ["csv", "xls", "csv", "xls"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -97,6 +97,22 @@ class StockOhlcvByDateTest(unittest.TestCase):
         self.assertIsNotNone(df)
         self.assertEqual(len(df), 6)
 
+    def test_server_bars_match_resampled_bars(self):
+        how = {'시가': 'first', '고가': 'max', '저가': 'min', '종가': 'last', '거래량': 'sum'}
+        for freq, fromdate, todate in (('w', "20200106", "20200626"), ('m', "20200101", "20200630")):
+            df = stock.get_market_ohlcv_by_date(fromdate, todate, "005930", freq)
+            daily = stock.get_market_ohlcv_by_date(fromdate, todate, "005930")
+            expected = stock.resample_ohlcv(daily, freq, how)
+            self.assertEqual(df.index.tolist(), expected.index.tolist())
+            self.assertEqual(df.values.tolist(), expected.values.tolist())
+
+    def test_io_for_multiple_tickers(self):
+        df = stock.get_market_ohlcv_by_date("20200701", "20200717", ["005930", "000660"])
+        self.assertEqual(df.index.names, ['날짜', '티커'])
+        self.assertEqual(set(df.index.get_level_values('티커')), {"005930", "000660"})
+        single = stock.get_market_ohlcv_by_date("20200701", "20200717", "000660")
+        self.assertTrue((df.xs("000660", level='티커') == single).all().all())
+
 
 class StockOhlcvByTickerTest(unittest.TestCase):
     def test_io(self):
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+from pykrx.website.naver import wrap
+
+
+def _sise(rows):
+    items = "".join('<item data="{}" />'.format("|".join(map(str, row))) for row in rows)
+    return ('<?xml version="1.0" encoding="EUC-KR" ?><protocol>'
+            '<chartdata symbol="005930" name="삼성전자" count="{}" timeframe="day" precision="0" '
+            'origintime="19900103">{}</chartdata></protocol>'.format(len(rows), items))
+
+
+class SiseParseTest(unittest.TestCase):
+    rows = [("20200224", 100, 110, 90, 105, 1000),
+            ("20200225", 105, 115, 95, 110, 2000),
+            ("20200226", 110, 120, 100, 115, 3000),
+            ("20200227", 115, 125, 105, 120, 4000)]
+
+    def test_window_is_filtered(self):
+        dates, values = wrap._parse(_sise(self.rows), "20200225", "20200226", 1)
+        self.assertEqual(dates, ["20200225", "20200226"])
+        self.assertEqual(values.tolist(), [[105, 115, 95, 110, 2000], [110, 120, 100, 115, 3000]])
+
+    def test_count_is_bounded_by_trading_days(self):
+        with mock.patch.object(wrap.Sise, "fetch", return_value=_sise(self.rows)) as fetch, \
+                mock.patch.object(wrap, "trading_days", return_value=["20200226", "20200227"]):
+            df = wrap.get_market_ohlcv_by_date("20200226", "20200227", "005930")
+        self.assertEqual(fetch.call_args[0][1], 3)
+        self.assertEqual(list(df.columns), ['시가', '고가', '저가', '종가', '거래량'])
+        self.assertEqual(df['종가'].tolist(), [115, 120])
+        self.assertEqual(df.index.name, '날짜')
+
+
+    def test_weekly_bars_are_labeled_by_period_end(self):
+        rows = [("20200224", 100, 120, 90, 115, 10000), ("20200302", 115, 130, 110, 125, 20000)]
+        with mock.patch.object(wrap.Sise, "fetch", return_value=_sise(rows)) as fetch:
+            df = wrap.get_market_ohlcv_by_date("20200224", "20200306", "005930", "week")
+        self.assertEqual(fetch.call_args[0][2], "week")
+        self.assertEqual([x.strftime("%Y%m%d") for x in df.index], ["20200301", "20200308"])
+        self.assertEqual(df['거래량'].tolist(), [10000, 20000])
+
+
+if __name__ == '__main__':
+    unittest.main()
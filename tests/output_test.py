@@ -0,0 +1,76 @@
+import importlib.util
+import unittest
+import numpy as np
+import pandas as pd
+from pykrx import stock
+from pykrx.stock.output import apply_dtype_profile, to_format
+
+
+def _frame():
+    df = pd.DataFrame({'종목명': ["동화약품", "우리은행", "동화약품"],
+                       '종가': np.array([11250, 15400, 717], dtype=np.int32),
+                       '거래량': np.array([1510666, 11623346, 9521456], dtype=np.int64),
+                       '시총비중': np.array([0.01, 0.25, 0.5], dtype=np.float16),
+                       'PER': np.array([44.19, 24.98, 247.27])},
+                      index=pd.Index(["000020", "000030", "000040"], name='티커'))
+    df.columns.name = "test"
+    return df
+
+
+class DtypeProfileTest(unittest.TestCase):
+    def tearDown(self):
+        stock.set_dtype_profile("default")
+
+    def test_default_keeps_dtypes(self):
+        df = _frame()
+        self.assertIs(apply_dtype_profile(df, "default"), df)
+
+    def test_safe_widens_numbers(self):
+        df = apply_dtype_profile(_frame(), "safe")
+        self.assertEqual(df['거래량'].dtype, np.int64)
+        self.assertEqual(df['시총비중'].dtype, np.float64)
+        self.assertEqual(df['종목명'].tolist(), ["동화약품", "우리은행", "동화약품"])
+
+    def test_compact(self):
+        df = apply_dtype_profile(_frame(), "compact")
+        self.assertEqual(df['종목명'].dtype, 'category')
+        self.assertEqual(df['종가'].dtype, np.int32)
+        self.assertEqual(df['거래량'].dtype, np.int32)
+        self.assertEqual(df['PER'].dtype, np.float32)
+        self.assertEqual(df.columns.name, "test")
+        self.assertEqual(list(df.index), ["000020", "000030", "000040"])
+
+    def test_unknown_profile(self):
+        self.assertRaises(ValueError, stock.set_dtype_profile, "small")
+
+
+class OutputFormatTest(unittest.TestCase):
+    def tearDown(self):
+        stock.set_output_format("pandas")
+
+    def test_pandas_is_default(self):
+        df = _frame()
+        self.assertIs(to_format(df, "pandas"), df)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, stock.set_output_format, "csv")
+        self.assertRaises(ValueError, to_format, _frame(), "csv")
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed")
+    def test_arrow(self):
+        table = to_format(_frame(), "arrow")
+        self.assertEqual(table.column_names, ['티커', '종목명', '종가', '거래량', '시총비중', 'PER'])
+        self.assertEqual(table.num_rows, 3)
+
+    @unittest.skipIf(importlib.util.find_spec("polars") is None, "polars is not installed")
+    def test_polars(self):
+        df = to_format(_frame(), "polars")
+        self.assertEqual(df.columns, ['티커', '종목명', '종가', '거래량', '시총비중', 'PER'])
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow") is not None, "pyarrow is installed")
+    def test_missing_dependency(self):
+        self.assertRaises(ImportError, to_format, _frame(), "arrow")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from pykrx.stock import api
+from pykrx.stock.api import resample_ohlcv
+from pykrx.website.krx import CalendarError
+
+HOW = {'시가': 'first', '고가': 'max', '저가': 'min', '종가': 'last', '거래량': 'sum'}
+
+
+def _ohlcv(fromdate, todate, base=0):
+    index = pd.bdate_range(fromdate, todate, name='날짜')
+    price = np.arange(len(index)) + base
+    return pd.DataFrame({'시가': price, '고가': price + 5, '저가': price - 5, '종가': price + 1,
+                         '거래량': np.full(len(index), 2 ** 30)}, index=index).astype(np.int32)
+
+
+class ResampleTest(unittest.TestCase):
+    def test_monthly_bars(self):
+        df = resample_ohlcv(_ohlcv("20200101", "20200331"), 'm', HOW)
+        self.assertEqual([x.strftime("%Y%m%d") for x in df.index], ["20200131", "20200229", "20200331"])
+        self.assertEqual(df['시가'].tolist(), [0, 23, 43])
+        self.assertEqual(df['종가'].tolist(), [23, 43, 65])
+        # 합계는 int32를 넘어도 정확해야 한다
+        self.assertEqual(df['거래량'].iloc[0], 23 * 2 ** 30)
+
+    def test_panel_is_grouped_by_ticker(self):
+        panel = pd.concat([_ohlcv("20200101", "20200630"), _ohlcv("20200101", "20200630", 100)],
+                          keys=["000020", "005930"], names=['티커', '날짜']).swaplevel().sort_index()
+        df = resample_ohlcv(panel, 'q', HOW)
+        self.assertEqual(df.index.names, ['날짜', '티커'])
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df.xs("005930", level='티커')['시가'].tolist(), [100, 165])
+
+    def test_unknown_freq(self):
+        self.assertRaises(ValueError, resample_ohlcv, _ohlcv("20200101", "20200131"), 'x', HOW)
+
+
+    def test_period_alignment_skips_holidays(self):
+        def trading_days(fromdate, todate):
+            return [d.strftime("%Y%m%d") for d in pd.bdate_range(fromdate, todate)
+                    if d.strftime("%Y%m%d") != "20200101"]
+        with mock.patch.object(api.krx, "trading_days", side_effect=trading_days):
+            # 1월 1일은 휴장일이므로 1월 2일부터의 조회는 월의 경계와 맞는다
+            self.assertTrue(api._is_period_aligned("20200102", "20200331", 'm'))
+            self.assertFalse(api._is_period_aligned("20200103", "20200331", 'm'))
+            self.assertFalse(api._is_period_aligned("20200102", "20200330", 'm'))
+
+    def test_period_alignment_without_calendar(self):
+        with mock.patch.object(api.krx, "trading_days", side_effect=CalendarError("offline")):
+            self.assertFalse(api._is_period_aligned("20200102", "20200331", 'm'))
+            self.assertTrue(api._is_period_aligned("20200101", "20200331", 'm'))
+
+
+if __name__ == '__main__':
+    unittest.main()
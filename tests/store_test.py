@@ -0,0 +1,160 @@
+import datetime
+import warnings
+import threading
+import unittest
+import tempfile
+from unittest import mock
+import pandas as pd
+from pykrx.stock import store
+from pykrx.stock.store import DataStore
+
+
+def _weekdays(fromdate, todate):
+    return [d.strftime("%Y%m%d") for d in pd.bdate_range(fromdate, todate)]
+
+
+class DataStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = DataStore()
+        self.store.configure(enabled=True, path=self.tmp.name)
+        self.calls = []
+
+    def tearDown(self):
+        self.store.path = None
+        self.tmp.cleanup()
+
+    def fetch(self, fromdate, todate):
+        self.calls.append((fromdate, todate))
+        index = pd.bdate_range(fromdate, todate, name='날짜')
+        return pd.DataFrame({'종가': range(len(index))}, index=index).astype('int32')
+
+    def test_only_missing_ranges_are_fetched(self):
+        self.store.read("ohlcv", "000020", "20191220", "20200110", self.fetch)
+        df = self.store.read("ohlcv", "000020", "20191201", "20200131", self.fetch)
+        # 없는 기간만 연 단위로 나눠서 조회
+        self.assertEqual(sorted(self.calls), [("20191201", "20191219"), ("20191220", "20191231"),
+                                              ("20200101", "20200110"), ("20200111", "20200131")])
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(len(df), len(pd.bdate_range("20191201", "20200131")))
+
+    def test_stored_range_does_not_hit_network(self):
+        self.store.read("cap", "005930", "20190101", "20191231", self.fetch)
+        df = self.store.read("cap", "005930", "20190301", "20190331", self.fetch)
+        self.assertEqual(self.calls, [("20190101", "20191231")])
+        self.assertEqual(df.index[0], pd.Timestamp("2019-03-01"))
+        self.assertEqual(df['종가'].dtype, 'int32')
+
+    def test_throttled_empty_range_is_refetched(self):
+        responses = [pd.DataFrame()]
+
+        def throttled(fromdate, todate):
+            # 첫 응답은 과부하로 인한 빈 결과
+            return responses.pop() if responses else self.fetch(fromdate, todate)
+        with mock.patch.object(store, "trading_days", side_effect=_weekdays):
+            self.assertTrue(self.store.read("ohlcv", "000020", "20190101", "20190131", throttled).empty)
+            df = self.store.read("ohlcv", "000020", "20190101", "20190131", throttled)
+        self.assertEqual(len(df), len(pd.bdate_range("20190101", "20190131")))
+
+    def test_proven_empty_range_is_recorded(self):
+        def delisted(fromdate, todate):
+            self.calls.append((fromdate, todate))
+            return pd.DataFrame()
+        with mock.patch.object(store, "trading_days", side_effect=_weekdays):
+            # 거래일이 없는 구간
+            self.store.read("ohlcv", "000020", "20200104", "20200105", delisted)
+            self.store.read("ohlcv", "000020", "20200104", "20200105", delisted)
+            # 상폐 이후의 구간
+            self.store.read("ohlcv", "000020", "20200201", "20200229", delisted, lambda: "20200131")
+            self.store.read("ohlcv", "000020", "20200201", "20200229", delisted, lambda: "20200131")
+        self.assertEqual(self.calls, [("20200104", "20200105"), ("20200201", "20200229")])
+
+    def test_failed_range_is_not_recorded(self):
+        def flaky(fromdate, todate):
+            if fromdate < "20200101":
+                raise IOError("connection reset")
+            return self.fetch(fromdate, todate)
+        self.assertRaises(IOError, self.store.read, "ohlcv", "000020", "20191201", "20200131", flaky)
+        self.store.read("ohlcv", "000020", "20191201", "20200131", self.fetch)
+        # 성공한 2020년 구간은 저장되고 실패한 구간만 다시 받는다
+        self.assertEqual(self.calls, [("20200101", "20200131"), ("20191201", "20191231")])
+
+
+class AdjustedStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = DataStore()
+        self.store.configure(enabled=True, path=self.tmp.name)
+        self.calls = []
+        self.scale = 1
+
+    def tearDown(self):
+        self.store.path = None
+        self.store.adjusted_ttl = 600
+        self.tmp.cleanup()
+
+    def fetch(self, fromdate, todate):
+        # Sise 처럼 fromdate 부터 오늘까지 반환
+        self.calls.append(fromdate)
+        index = pd.bdate_range(fromdate, datetime.date.today(), name='날짜')
+        price = (1000 + (index - pd.Timestamp("20190101")).days) // self.scale
+        return pd.DataFrame({c: price for c in ['시가', '고가', '저가', '종가']}, index=index)
+
+    def test_tail_refresh(self):
+        self.store.read_adjusted("005930", "20190101", "20190131", self.fetch)
+        self.store.adjusted_ttl = 0
+        df = self.store.read_adjusted("005930", "20190201", "20190228", self.fetch)
+        self.assertEqual(len(self.calls), 2)
+        # 두 번째 요청은 최근 구간만 받는다
+        self.assertGreater(self.calls[1], "20190101")
+        self.assertEqual(len(df), len(pd.bdate_range("20190201", "20190228")))
+
+    def test_corporate_action_refetches_history(self):
+        self.store.read_adjusted("005930", "20190101", "20190131", self.fetch)
+        self.store.adjusted_ttl = 0
+        self.scale = 2
+        df = self.store.read_adjusted("005930", "20190101", "20190131", self.fetch)
+        self.assertEqual(self.calls[-1], "20190101")
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(df['종가'].iloc[0], 500)
+
+    def test_failed_refresh_keeps_history(self):
+        self.store.read_adjusted("005930", "20190101", "20190131", self.fetch)
+        self.store.adjusted_ttl = 0
+        for error in [pd.DataFrame(), IOError("connection reset")]:
+            def throttled(fromdate, todate):
+                self.calls.append(fromdate)
+                if isinstance(error, Exception):
+                    raise error
+                return error
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                df = self.store.read_adjusted("005930", "20190101", "20190131", throttled)
+            self.assertEqual(len(df), len(pd.bdate_range("20190101", "20190131")))
+        # 최근 구간만 시도하고 전체 이력은 다시 받지 않는다
+        self.assertEqual(len(self.calls), 3)
+        self.assertGreater(min(self.calls[1:]), "20190101")
+
+    def test_tickers_are_fetched_concurrently(self):
+        started = threading.Event()
+
+        def slow(fromdate, todate):
+            started.set()
+            # 다른 종목의 조회가 끝나야 반환된다 - 전역 잠금을 쥐고 있으면 시간 초과
+            waited.append(done.wait(5))
+            return self.fetch(fromdate, todate)
+
+        done, waited = threading.Event(), []
+        thread = threading.Thread(target=self.store.read_adjusted,
+                                  args=("005930", "20190101", "20190131", slow))
+        thread.start()
+        started.wait(5)
+        self.store.read_adjusted("000660", "20190101", "20190131", self.fetch)
+        done.set()
+        thread.join()
+        self.assertEqual(waited, [True])
+        self.assertEqual(len(self.calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+import datetime
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from pykrx.website.krx.market.ticker import _StockTicker, IndexTicker
+from pykrx.website.krx.e3.etf.ticker import EtfTicker
+from pykrx.stock.universe import UniverseHistory
+
+
+def _listed():
+    df = pd.DataFrame({'종목': ['삼성전자', 'SK하이닉스'],
+                       'ISIN': ['KR7005930003', 'KR7000660001'],
+                       '시장': ['KOSPI', 'KOSPI']},
+                      index=pd.Index(['005930', '000660'], name='티커'))
+    return df
+
+
+def _delisted():
+    df = pd.DataFrame({'종목': ['에스마크', '가희 11R'],
+                       'ISIN': ['KR7030270003', 'KRA030270151'],
+                       '시장': ['KOSDAQ', 'KOSDAQ'],
+                       '상폐일': ['20150612', '20110512']},
+                      index=pd.Index(['030270', '030270'], name='티커'))
+    return df
+
+
+class StockTickerTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.calls = []
+        self.master = _StockTicker()
+        self.master.configure(path=self.path, ttl=60)
+        self.master._get_stock_info_listed = lambda: self.fetch("listed", _listed())
+        self.master._get_stock_info_delisted = lambda: self.fetch("delisted", _delisted())
+
+    def tearDown(self):
+        del self.master._get_stock_info_listed
+        del self.master._get_stock_info_delisted
+        self.master.configure(ttl=24 * 60 * 60)
+        self.master.path = None
+        self.master._frames = {}
+        self.master._symbols = {}
+        shutil.rmtree(self.path)
+
+    def fetch(self, part, df):
+        self.calls.append(part)
+        return df
+
+    def test_delisted_is_loaded_on_miss(self):
+        self.assertEqual(self.master.get('005930').isin, 'KR7005930003')
+        self.assertEqual(self.calls, ["listed"])
+        self.assertEqual(self.master.get('030270').isin, 'KR7030270003')
+        self.assertEqual(self.calls, ["listed", "delisted"])
+
+    def test_snapshot_is_shared(self):
+        self.master.get('005930')
+        # 다른 프로세스처럼 메모리의 목록을 비우고 다시 조회
+        self.master._frames = {}
+        self.master._symbols = {}
+        self.master.get('000660')
+        self.assertEqual(self.calls, ["listed"])
+
+    def test_refresh(self):
+        self.master.get('005930')
+        self.master.refresh("listed")
+        self.assertEqual(self.calls, ["listed", "listed"])
+
+    def test_expired_snapshot(self):
+        self.master.get('005930')
+        self.master._frames = {}
+        self.master._symbols = {}
+        self.master.configure(ttl=-1)
+        self.master.get('005930')
+        self.assertEqual(self.calls, ["listed", "listed"])
+
+    def test_resolve(self):
+        isins = self.master.resolve(['000660', '030270', '999999'], "isin")
+        self.assertEqual(isins.tolist(), ['KR7000660001', 'KR7030270003', None])
+        self.assertEqual(isins.index.tolist(), ['000660', '030270', '999999'])
+        self.assertEqual(self.master.resolve(['005930'], "name").tolist(), ['삼성전자'])
+        self.assertIsNone(self.master.get('999999'))
+
+
+class IndexTickerTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        records = [["1001", "코스피", "KOSPI", "19800104"],
+                   ["1028", "코스피 200", "KOSPI", "19900103"],
+                   ["1034", "코스피 100", "KOSPI", "20000104"],
+                   ["1005", "음식료품", "KOSPI", "19800104"],
+                   ["2001", "코스닥", "KOSDAQ", "19960701"]]
+        with open(os.path.join(self.path, "index.json"), "w") as f:
+            json.dump(records, f)
+        self.master = IndexTicker()
+        self.master.configure(path=self.path)
+
+    def tearDown(self):
+        self.master.configure(ttl=24 * 60 * 60)
+        self.master.path = None
+        self.master._names = None
+        shutil.rmtree(self.path)
+
+    def test_get_ticker(self):
+        self.assertEqual(self.master.get_ticker("KOSPI", "19800104"), ["1001", "1005"])
+        self.assertEqual(self.master.get_ticker("KOSPI", "20170717"), ["1001", "1028", "1034", "1005"])
+        self.assertEqual(self.master.get_ticker("KOSDAQ", "19900101"), [])
+
+    def test_name_and_market(self):
+        self.assertEqual(self.master.get_name("1028"), "코스피 200")
+        self.assertEqual(self.master.get_market("2001"), "KOSDAQ")
+
+    def test_failed_build(self):
+        self.master.configure(path=tempfile.mkdtemp(), ttl=0)
+        with mock.patch("pykrx.website.krx.market.ticker._fetch_index_master", return_value=[]):
+            self.assertEqual(self.master.get_ticker("KOSPI", "20170717"), [])
+
+
+class EtfTickerTest(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.fetched = []
+        self.master = EtfTicker()
+        self.master.configure(path=self.path, maxsize=2)
+        self.master._get_tickers = self.fetch
+        self.master._get_closest_business_day = lambda: "20200720"
+
+    def tearDown(self):
+        del self.master._get_tickers
+        del self.master._get_closest_business_day
+        self.master.configure(maxsize=32)
+        self.master.path = None
+        self.master._master = None
+        self.master._listings.clear()
+        shutil.rmtree(self.path)
+
+    def fetch(self, date):
+        self.fetched.append(date)
+        tickers = ['069500', '102110'] if date < "20200720" else ['069500', '346000']
+        return pd.DataFrame({'isin': ['KR7{}00{}'.format(t, date[-1]) for t in tickers],
+                             'name': ['ETF {}'.format(t) for t in tickers]},
+                            index=pd.Index(tickers, name='ticker'))
+
+    def test_listing_per_date(self):
+        self.assertEqual(self.master.get_ticker("20200717"), ['069500', '102110'])
+        self.assertEqual(self.master.get_ticker("20200720"), ['069500', '346000'])
+        self.assertEqual(self.master.get_ticker("20200717"), ['069500', '102110'])
+        self.assertEqual(self.fetched, ["20200717", "20200720"])
+        # maxsize 를 넘으면 가장 오래 사용하지 않은 날짜부터 버린다
+        self.master.get_ticker("20200721")
+        self.master.get_ticker("20200720")
+        self.assertEqual(self.fetched, ["20200717", "20200720", "20200721", "20200720"])
+
+    def test_master(self):
+        self.master.get_ticker("20200717")
+        self.master.get_ticker("20200720")
+        self.assertEqual(self.master.get_isin('069500'), 'KR7069500000')
+        self.assertEqual(self.master.get_isin('102110'), 'KR7102110007')
+        self.assertEqual(self.master.get_interval('069500'), ("20200717", "20200720"))
+        # 저장된 master 로 다른 프로세스에서도 네트워크 없이 조회
+        self.master._master = None
+        self.master._listings.clear()
+        self.fetched = []
+        self.assertEqual(self.master.get_name('102110'), 'ETF 102110')
+        self.assertEqual(self.fetched, [])
+
+    def test_unknown_ticker_loads_latest_listing(self):
+        self.assertEqual(self.master.get_isin('346000'), 'KR7346000000')
+        self.assertEqual(self.fetched, ["20200720"])
+
+
+class UniverseHistoryTest(unittest.TestCase):
+    # 20190104 상장 B / 20190110 상폐 A (상폐일 있음) / 20190114 시장 이전 C (상폐일 없음)
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.fetched = []
+        self.history = UniverseHistory()
+        self.history.configure(path=self.path)
+
+    def tearDown(self):
+        self.history.path = None
+        self.history._histories = {}
+        shutil.rmtree(self.path)
+
+    def fetch(self, date):
+        self.fetched.append(date)
+        if date == "20190101":
+            # 휴장일
+            return []
+        tickers = ["C"]
+        if date >= "20190104":
+            tickers.append("B")
+        if date < "20190110":
+            tickers.append("A")
+        if date >= "20190114":
+            tickers.remove("C")
+        return tickers
+
+    def tickers(self, date):
+        return self.history.tickers(date, "KOSPI", self.fetch, lambda tickers: {"A": "20190110"})
+
+    def test_interpolated_dates_match_snapshots(self):
+        self.assertEqual(self.tickers("20190103"), ["A", "C"])
+        self.assertEqual(self.tickers("20190131"), ["B"])
+        for date in ["20190104", "20190109", "20190110", "20190111", "20190114", "20190115"]:
+            self.assertEqual(self.tickers(date), sorted(self.fetch(date)), date)
+
+    def test_snapshots_are_persisted(self):
+        self.tickers("20190103")
+        self.tickers("20190131")
+        self.tickers("20190108")
+        self.history._histories = {}
+        self.fetched = []
+        self.assertEqual(self.tickers("20190108"), ["A", "B", "C"])
+        self.assertEqual(self.fetched, [])
+
+    def test_membership(self):
+        df = self.history.membership("20190101", "20190115", "KOSPI", self.fetch,
+                                     lambda tickers: {"A": "20190110"})
+        self.assertEqual(df.columns.tolist(), ["A", "B", "C"])
+        self.assertNotIn(pd.Timestamp("20190101"), df.index)
+        self.assertEqual(df.loc["2019-01-09"].tolist(), [True, True, True])
+        self.assertEqual(df.loc["2019-01-10"].tolist(), [False, True, True])
+        self.assertEqual(df.loc["2019-01-14"].tolist(), [False, True, False])
+        self.assertLess(len(self.fetched), len(df))
+
+    def test_today_is_not_persisted(self):
+        today = datetime.date.today().strftime("%Y%m%d")
+
+        def everyday(fromdate, todate):
+            return [d.strftime("%Y%m%d") for d in pd.date_range(fromdate, todate)]
+
+        def tickers():
+            return self.history.tickers(today, "KOSPI", self.fetch, lambda tickers: {}, everyday)
+        self.assertEqual(tickers(), ["B"])
+        self.assertEqual(tickers(), ["B"])
+        self.assertEqual(self.fetched, [today])
+        # 장중의 목록은 파일에 저장되지 않으므로 다른 프로세스는 다시 받는다
+        self.history._histories = {}
+        tickers()
+        self.assertEqual(self.fetched, [today, today])
+        self.assertEqual(self.history._history("KOSPI").dates, [])
+
+
+if __name__ == '__main__':
+    unittest.main()